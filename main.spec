@@ -6,7 +6,7 @@ a = Analysis(
     # Corrected DATAS path: 'assets' is in the root relative to where you run pyinstaller,
     # so we just need 'assets' as the source.
     # The destination within the exe can still be 'assets'.
-    datas=[('assets', 'assets')], # Corrected this line
+    datas=[('assets', 'assets'), ('src/run_worker.py', '.')], # Corrected this line
     hiddenimports=[],
     hookspath=[],
     hooksconfig={},
@@ -5,6 +5,7 @@ from tkinter import ttk, font
 from tkinter import scrolledtext
 import re
 import ast
+import bisect
 import os
 import inspect
 import keyword
@@ -13,6 +14,95 @@ from typing import TYPE_CHECKING, Dict, Any, List, Tuple, Set, Optional
 if TYPE_CHECKING:
     from src.code_editor import CodeEditor
 
+# Highlighting patterns that never change; compiled once instead of being
+# looked up in re's pattern cache on every highlight pass
+COMMENT_PATTERN = re.compile(r"(#.*)")
+TRIPLE_QUOTED_STRING_PATTERNS = tuple(
+    re.compile(pattern, re.DOTALL)
+    for pattern in (r"f'''(.*?)'''", r'f"""(.*)"""', r"'''(.*?)'''", r'"""(.*)"""')
+)
+FSTRING_EXPRESSION_PATTERN = re.compile(r"\{(.+?)\}")
+STRING_PATTERN = re.compile(
+    r"""(f?r?|r?f?)b?'[^'\\\n]*(?:\\.[^'\\\n]*)*'|(f?r?|r?f?)b?\"[^\\"\\\n]*(?:\\.[^\\"\\\n]*)*\""""
+)
+DECORATOR_NAME_PATTERN = re.compile(r"@([\w\.]+)")
+CONSTANT_NAME_PATTERN = re.compile(r"\b([A-Z_][A-Z0-9_]+)\b")
+SELF_MEMBER_PATTERN = re.compile(r"\bself\.([\w]+)\b")
+NUMBER_PATTERN = re.compile(
+    r"\b(0[xX][0-9a-fA-F]+|0[oO][0-7]+|0[bB][01]+|\d+(\.\d*)?([eE][+-]?\d+)?)\b"
+)
+# (pattern, tag) pairs for keyword-like tokens; builtins and exceptions are
+# compiled per editor since their lists live on the instance
+KEYWORD_HIGHLIGHT_PATTERNS = tuple(
+    (re.compile(pattern), tag)
+    for pattern, tag in (
+        (r"\bdef\b", "def_keyword"),
+        (r"\bclass\b", "class_keyword"),
+        (r"\b(if|else|elif)\b", "keyword_conditional"),
+        (r"\b(for|while|break|continue)\b", "keyword_loop"),
+        (r"\b(return|yield)\b", "keyword_return"),
+        (r"\b(pass|global|nonlocal|del)\b", "keyword_structure"),
+        (r"\b(import|from|as)\b", "keyword_import"),
+        (r"\b(try|except|finally|raise|assert)\b", "keyword_exception"),
+        (r"\b(True|False|None)\b", "keyword_boolean_null"),
+        (r"\b(and|or|not|in|is)\b", "keyword_logical"),
+        (r"\b(async|await)\b", "keyword_async"),
+        (r"\b(with|lambda)\b", "keyword_context"),
+        (r"\bPriesty\b", "priesty_keyword"),
+        (r"\bself\b", "self_keyword"),
+    )
+)
+BRACKET_PATTERN = re.compile(r"[(){}[\]]")
+DUNDER_METHOD_PATTERN = re.compile(r"\b(__init__|__str__|__repr__)\b")
+
+# Autocomplete patterns, matched against the current line on every keystroke
+EXCEPT_CLAUSE_PATTERN = re.compile(r"^\s*except(?:\s+(.*))?$")
+ALIAS_CLAUSE_PATTERN = re.compile(r"\bas\s+\w*$")
+FROM_IMPORT_PATTERN = re.compile(r"^\s*from\s+([\w\.]+)\s+import(?:\s+(.*))?$")
+IMPORT_PATTERN = re.compile(r"^\s*(?:import|from)\s+(?!.*\bas\b)([\w.]*)$")
+DOT_ACCESS_PATTERN = re.compile(r"(\b[\w_]+)\.([\w_]*)$")
+DECORATOR_PREFIX_PATTERN = re.compile(r"@\w*$")
+SNIPPET_PLACEHOLDER_PATTERN = re.compile(r"\$\{(\d+):(.+?)\}")
+# Indentation of a line; matched on every Return, Tab and class lookup
+LEADING_WHITESPACE_PATTERN = re.compile(r"^(\s*)")
+# Fallback import parsing, used while the buffer does not parse as Python
+IMPORT_STATEMENT_PATTERN = re.compile(r"^\s*import\s+([^\n]+)", re.MULTILINE)
+FROM_IMPORT_STATEMENT_PATTERN = re.compile(
+    r"^\s*from\s+([\w.]+)\s+import\s+([^\n]+)", re.MULTILINE
+)
+COMMA_SEPARATOR_PATTERN = re.compile(r"\s*,\s*")
+AS_SEPARATOR_PATTERN = re.compile(r"\s+as\s+")
+# Keys whose release moves the cursor or is handled elsewhere, so they never
+# refresh bracket matching or autocomplete
+KEY_RELEASE_IGNORED_KEYS = frozenset(
+    {
+        "Up",
+        "Down",
+        "Left",
+        "Right",
+        "Return",
+        "Tab",
+        "Escape",
+        "period",
+        "Shift_L",
+        "Shift_R",
+        "Control_L",
+        "Control_R",
+        "Alt_L",
+        "Alt_R",
+        "Super_L",
+        "Super_R",
+    }
+)
+
+
+def _group_by_first_letter(names):
+    """Groups names by their lowercased first letter, keeping their order."""
+    groups = {}
+    for name in names:
+        groups.setdefault(name[:1].lower(), []).append(name)
+    return groups
+
 
 class Gutter(tk.Canvas):
     """A canvas for drawing line numbers and gutter markers (e.g., for errors)."""
@@ -51,6 +141,8 @@ class Gutter(tk.Canvas):
             first_line = int(self.text_area.index("@0,0").split(".")[0])
         except (ValueError, tk.TclError):
             return
+        # Queried once; asking inside the loop cost a Tk call per line
+        canvas_height = self.winfo_height()
 
         for i in range(500):  # Limit redraw loop to prevent freezing on huge files
             line_num = first_line + i
@@ -58,7 +150,7 @@ class Gutter(tk.Canvas):
             if not dline:
                 break
             x, y, _, h, _ = dline
-            if y > self.winfo_height():
+            if y > canvas_height:
                 break
 
             # Draw line number
@@ -98,6 +190,7 @@ class Minimap(tk.Canvas):
         super().__init__(master, **kwargs)
         self.text_area = text_area
         self.config(highlightthickness=0, width=120, bg="#252526")
+        self.image: tk.PhotoImage | None = None
         self.bind("<B1-Motion>", self._on_drag)
         self.bind("<ButtonPress-1>", self._on_click)
 
@@ -112,37 +205,64 @@ class Minimap(tk.Canvas):
             canvas_h = self.winfo_height()
             line_h = max(1, canvas_h / total_lines) if canvas_h > 1 else 1
             canvas_w = self.winfo_width()
-
+            # Lines are at least 1px tall, so in long files everything past
+            # the canvas bottom would be drawn where it can never be seen
+            if canvas_h > 1:
+                all_lines = all_lines[: int(canvas_h / line_h) + 1]
+
+            # Two tag_ranges calls replace a tag_names call per line
+            error_lines = self._lines_starting_in_tag("proactive_error_squiggle")
+            comment_lines = self._lines_starting_in_tag("comment_tag")
+
+            # Rows are painted into one image instead of one canvas
+            # rectangle per line
+            if self.image is None:
+                self.image = tk.PhotoImage(master=self)
+            self.image.blank()
+            self.image.configure(
+                width=max(1, canvas_w), height=max(1, int(len(all_lines) * line_h))
+            )
             for i, line_text in enumerate(all_lines):
-                y0 = i * line_h
-                y1 = y0 + line_h
-                color = self._get_line_color(f"{i+1}.0", line_text)
+                stripped_line = line_text.strip()
+                if not stripped_line:
+                    continue
+                line_num = i + 1
+                # Peeking at the first character rules out most lines before
+                # any startswith call is made
+                first_char = stripped_line[0]
+                if line_num in error_lines:
+                    color = "#E51400"
+                elif line_num in comment_lines or first_char == "#":
+                    color = "#6A9955"
+                elif first_char in "dc" and stripped_line.startswith(
+                    ("def ", "class ")
+                ):
+                    color = "#4EC9B0"
+                else:
+                    color = "#777777"
                 indent_len = len(line_text) - len(line_text.lstrip())
-                text_len = len(line_text.strip())
-                x0 = indent_len * 2
-                x1 = x0 + text_len * 1.2
-                self.create_rectangle(
-                    min(x0, canvas_w - 5),
-                    y0,
-                    min(x1, canvas_w - 5),
-                    y1,
-                    fill=color,
-                    outline="",
-                )
+                x0 = int(min(indent_len * 2, canvas_w - 5))
+                x1 = int(min(indent_len * 2 + len(stripped_line) * 1.2, canvas_w - 5))
+                if x1 > x0:
+                    self.image.put(
+                        color, to=(x0, int(i * line_h), x1, int((i + 1) * line_h))
+                    )
+            self.create_image(0, 0, image=self.image, anchor="nw")
         except (tk.TclError, IndexError):
             pass
         self.update_viewport()
 
-    def _get_line_color(self, index, line_text):
-        tags = self.text_area.tag_names(index)
-        stripped_line = line_text.strip()
-        if "proactive_error_squiggle" in tags:
-            return "#E51400"
-        if "comment_tag" in tags or (stripped_line and stripped_line.startswith("#")):
-            return "#6A9955"
-        if stripped_line.startswith(("def ", "class ")):
-            return "#4EC9B0"
-        return "#777777"
+    def _lines_starting_in_tag(self, tag):
+        """Returns the numbers of lines whose first character carries tag."""
+        lines = set()
+        ranges = self.text_area.tag_ranges(tag)
+        for start, end in zip(ranges[0::2], ranges[1::2]):
+            start_line, start_col = map(int, str(start).split("."))
+            end_line, end_col = map(int, str(end).split("."))
+            first = start_line if start_col == 0 else start_line + 1
+            last = end_line if end_col > 0 else end_line - 1
+            lines.update(range(first, last + 1))
+        return lines
 
     def update_viewport(self):
         self.delete("viewport")
@@ -207,9 +327,17 @@ class CodeAnalyzer:
     def __init__(self):
         self.tree = None
         self.definitions = {}
+        self._analyzed_code = None
 
     def analyze(self, code):
-        """Analyzes code, using a fault-tolerant method to generate an AST."""
+        """Analyzes code, using a fault-tolerant method to generate an AST.
+
+        Resizes, tab switches and font changes re-run the content pipeline
+        with unchanged text; the previous result is reused for those.
+        """
+        if code == self._analyzed_code:
+            return
+        self._analyzed_code = code
         self.definitions.clear()
 
         temp_code = code
@@ -438,6 +566,10 @@ class ScopeVisitor(ast.NodeVisitor):
 
 
 class AutocompleteManager:
+    # ttk styles are global to the Tk interpreter, so they are configured by
+    # the first instance only instead of again for every editor tab
+    _styles_configured = False
+
     def __init__(self, editor_instance, icons=None):
         self.editor = editor_instance
         self.text_area = editor_instance.text_area
@@ -510,9 +642,19 @@ class AutocompleteManager:
         self.paned_window.add(preview_outer_frame, weight=3)
 
         self.completions = []
+        # (text, type) of each row currently in the tree, by position
+        self._row_keys = []
+        # Popup sizing state; the preview height is measured after layout
+        self._list_height = 0
+        self._preview_height = 100
+        self._shown_geometry = (0, 0, 0)
+        self._fit_after_id = None
         self._configure_treeview()
 
-    def _configure_treeview(self):
+    def _configure_styles(self):
+        if AutocompleteManager._styles_configured:
+            return
+        AutocompleteManager._styles_configured = True
         self.style.configure(
             "TPanedwindow", background="#3C3C3C", sashwidth=4, sashrelief=tk.FLAT
         )
@@ -535,6 +677,8 @@ class AutocompleteManager:
             "Treeview", [("Treeview.treearea", {"sticky": "nswe"})]
         )  # Remove borders
 
+    def _configure_treeview(self):
+        self._configure_styles()
         self.tree.config(style="Treeview")
         self.tree.heading("#0", text="")
         self.tree.tag_configure("variable", foreground="#80D0FF")
@@ -561,31 +705,33 @@ class AutocompleteManager:
 
         self.completions = completions
         self.current_word_for_preview = current_word
-        self.tree.delete(*self.tree.get_children())
 
-        for i, item in enumerate(completions):
+        row_keys = []
+        for item in completions:
             item_type = item.get("type", "variable")
             symbol = self.icons.get(item_type, " ")
-            self.tree.insert(
-                "", "end", iid=i, text=f" {symbol} {item['label']}", tags=(item_type,)
-            )
+            row_keys.append((f" {symbol} {item['label']}", item_type))
+        # Rows are keyed by position, so only positions whose text or type
+        # changed are touched; a keystroke that keeps the list costs nothing
+        if row_keys != self._row_keys:
+            for i, (old_key, new_key) in enumerate(zip(self._row_keys, row_keys)):
+                if old_key != new_key:
+                    self.tree.item(i, text=new_key[0], tags=(new_key[1],))
+            if len(self._row_keys) > len(row_keys):
+                self.tree.delete(*range(len(row_keys), len(self._row_keys)))
+            for i in range(len(self._row_keys), len(row_keys)):
+                text, item_type = row_keys[i]
+                self.tree.insert("", "end", iid=i, text=text, tags=(item_type,))
+            self._row_keys = row_keys
 
         self.update_preview()
-        self.window.update_idletasks()
-
-        bbox_info = self.preview_text.dlineinfo("end-1c")
-        required_height = bbox_info[1] + bbox_info[3] + 15 if bbox_info else 100
-        if self.context_label.winfo_ismapped():
-            required_height += (
-                self.context_label.winfo_height()
-                + self.context_separator.winfo_height()
-            )
 
-        list_height = (
+        self._list_height = (
             min(len(completions), 10) * self.style.lookup("Treeview", "rowheight") + 10
         )
-        new_height = max(list_height, required_height)
-        new_height = min(new_height, 400)
+        # Sized from the last measured preview; the new preview is measured
+        # at idle time instead of forcing a layout pass on every keystroke
+        new_height = min(max(self._list_height, self._preview_height), 400)
 
         if not self.window.winfo_viewable():
             x, y, _, h = bbox
@@ -595,12 +741,38 @@ class AutocompleteManager:
             self.window.deiconify()
             self.window.lift()
         else:
-            current_x, current_y = self.window.winfo_x(), self.window.winfo_y()
-            self.window.geometry(f"600x{new_height}+{current_x}+{current_y}")
+            x, y = self.window.winfo_x(), self.window.winfo_y()
+            self.window.geometry(f"600x{new_height}+{x}+{y}")
+        self._shown_geometry = (new_height, x, y)
 
         if self.tree.get_children():
             self.tree.selection_set("0")
             self.tree.focus("0")
+            # Rows are updated in place, so the old scroll offset would remain
+            self.tree.see("0")
+
+        if self._fit_after_id is None:
+            self._fit_after_id = self.window.after_idle(self._fit_to_preview)
+
+    def _fit_to_preview(self):
+        """Resizes the popup once Tk has laid out the preview text."""
+        self._fit_after_id = None
+        if self.window.state() == "withdrawn":
+            return
+        bbox_info = self.preview_text.dlineinfo("end-1c")
+        required_height = bbox_info[1] + bbox_info[3] + 15 if bbox_info else 100
+        if self.context_label.winfo_ismapped():
+            required_height += (
+                self.context_label.winfo_height()
+                + self.context_separator.winfo_height()
+            )
+        self._preview_height = required_height
+
+        new_height = min(max(self._list_height, required_height), 400)
+        shown_height, x, y = self._shown_geometry
+        if new_height != shown_height:
+            self.window.geometry(f"600x{new_height}+{x}+{y}")
+            self._shown_geometry = (new_height, x, y)
 
     def hide(self):
         self.editor.clear_context_highlight()
@@ -757,8 +929,18 @@ class CodeEditor(tk.Frame):
         self.snippet_exit_mark_name = None
         self.autocomplete_just_navigated = False
         self.imported_aliases = {}
+        self.import_tooltips: Dict[str, str] = {}
+        self.import_member_tooltips: Dict[str, str] = {}
+        self._self_completions_cache = (None, [])
         self.code_analyzer = CodeAnalyzer()
+        # Line start offsets of the text last highlighted; see _offset_to_index
+        self._line_starts = [0]
         self.folds = {}
+        self.content_change_deferred = False
+        self._content_change_after_id = None
+        # Tk's own modified flag is reset after every edit to re-arm
+        # <<Modified>>, so unsaved state is tracked separately
+        self.has_unsaved_changes = False
         self.CONTEXT_DISPLAY_NAMES = {
             "loop_body": "Loop",
             "class": "Class",
@@ -834,6 +1016,8 @@ class CodeEditor(tk.Frame):
             pady=2,
         )
         self.tooltip_label.pack(ipadx=1)
+        # Text currently shown in the tooltip, or None while it is hidden
+        self._tooltip_text = None
         self.autocomplete_icons = {
             "snippet": "▶",
             "keyword": "🝰",
@@ -886,10 +1070,11 @@ class CodeEditor(tk.Frame):
         self.text_area.bind("<Down>", self._on_arrow_down)
         self.text_area.bind("<Control-space>", self._on_manual_autocomplete_trigger)
         self.text_area.bind("<Control-j>", self._on_manual_autocomplete_trigger)
-        self.bind("<Configure>", self._on_content_changed)
+        self.bind("<Configure>", self._schedule_content_changed)
+        self.master.bind("<Map>", self._on_tab_shown, add="+")
 
         self.text_area.edit_modified(False)
-        self.after(100, self._on_content_changed)
+        self._schedule_content_changed()
 
     def set_font_size(self, size: int):
         new_font = ("Consolas", size)
@@ -910,7 +1095,10 @@ class CodeEditor(tk.Frame):
         tooltip_font = ("Consolas", max(8, size - 1))
         self.tooltip_label.config(font=tooltip_font)
 
-        self.after(50, self._on_content_changed)
+        self._schedule_content_changed()
+
+    def mark_saved(self):
+        self.has_unsaved_changes = False
 
     def set_file_path(self, path: str):
         self.file_path = path
@@ -935,7 +1123,7 @@ class CodeEditor(tk.Frame):
             for i in range(current_line_num - 1, -1, -1):
                 line = lines[i]
                 if line.strip().startswith("class "):
-                    indent_match = re.match(r"^(\s*)", line)
+                    indent_match = LEADING_WHITESPACE_PATTERN.match(line)
                     if indent_match:
                         current_class_indent = len(indent_match.group(1))
                         current_cursor_line_indent = len(
@@ -988,7 +1176,7 @@ class CodeEditor(tk.Frame):
         for i in range(current_line_index, -1, -1):
             line = lines[i]
             if line.strip().startswith("class "):
-                indent_match = re.match(r"^(\s*)", line)
+                indent_match = LEADING_WHITESPACE_PATTERN.match(line)
                 if indent_match:
                     class_start_line, class_indent = i, len(indent_match.group(1))
                     break
@@ -1002,12 +1190,19 @@ class CodeEditor(tk.Frame):
                 if line.strip() and line_indent <= class_indent:
                     break
             if i == current_line_index:
-                indent_match = re.match(r"^(\s*)", line)
+                indent_match = LEADING_WHITESPACE_PATTERN.match(line)
                 indent_str = indent_match.group(1) if indent_match else ""
                 class_lines.append(indent_str + "pass")
             else:
                 class_lines.append(line)
         class_code_block = "\n".join(class_lines)
+        # Typing a member name after "self." leaves the class block (with the
+        # cursor line replaced by "pass") unchanged, so it is parsed only once
+        cache_key = (class_indent, class_code_block)
+        # Callers annotate the items (e.g. with a priority), so they get
+        # copies and the cached list stays as parsed
+        if self._self_completions_cache[0] == cache_key:
+            return [dict(c) for c in self._self_completions_cache[1]]
         completions = []
         try:
             unindented_code = re.sub(
@@ -1044,7 +1239,8 @@ class CodeEditor(tk.Frame):
                 )
         except SyntaxError:
             pass
-        return completions
+        self._self_completions_cache = (cache_key, completions)
+        return [dict(c) for c in completions]
 
     def _update_autocomplete_display(self, manual_trigger=False):
         if not self.autocomplete_active:
@@ -1058,7 +1254,7 @@ class CodeEditor(tk.Frame):
         stripped_line = line_text_before_cursor.strip()
 
         # --- Exception Assistance ---
-        except_match = re.search(r"^\s*except(?:\s+(.*))?$", stripped_line)
+        except_match = EXCEPT_CLAUSE_PATTERN.search(stripped_line)
         if except_match:
             captured_text = except_match.group(1) or ""
             partial_word = ""
@@ -1067,8 +1263,14 @@ class CodeEditor(tk.Frame):
 
             in_tuple = "(" in captured_text
             completions = []
-            for exc_name in self.exception_list:
-                if exc_name.lower().startswith(partial_word.lower()):
+            partial_word_lower = partial_word.lower()
+            candidates = (
+                self._exceptions_by_first_letter.get(partial_word_lower[0], ())
+                if partial_word_lower
+                else self.exception_list
+            )
+            for exc_name in candidates:
+                if exc_name.lower().startswith(partial_word_lower):
                     completions.append(
                         {
                             "label": exc_name,
@@ -1100,14 +1302,12 @@ class CodeEditor(tk.Frame):
             return
 
         # --- Suppress Autocomplete for Aliases ---
-        if re.search(r"\bas\s+\w*$", stripped_line):
+        if ALIAS_CLAUSE_PATTERN.search(stripped_line):
             self.autocomplete_manager.hide()
             return
 
         # --- Import Assistance ---
-        from_import_match = re.match(
-            r"^\s*from\s+([\w\.]+)\s+import(?:\s+(.*))?$", stripped_line
-        )
+        from_import_match = FROM_IMPORT_PATTERN.match(stripped_line)
         if from_import_match:
             module_name = from_import_match.group(1)
             members_text = from_import_match.group(2)
@@ -1141,16 +1341,21 @@ class CodeEditor(tk.Frame):
                 self.autocomplete_manager.hide()
             return
 
-        import_match = re.match(
-            r"^\s*(?:import|from)\s+(?!.*\bas\b)([\w.]*)$", stripped_line
-        )
+        import_match = IMPORT_PATTERN.match(stripped_line)
         if import_match or stripped_line in ["import", "from"]:
             partial_module = ""
             if import_match:
                 partial_module = import_match.group(1)
             completions = []
-            for name, data in self.standard_libraries.items():
-                if name.lower().startswith(partial_module.lower()):
+            partial_module_lower = partial_module.lower()
+            candidates = (
+                self._libraries_by_first_letter.get(partial_module_lower[0], ())
+                if partial_module_lower
+                else self.standard_libraries
+            )
+            for name in candidates:
+                if name.lower().startswith(partial_module_lower):
+                    data = self.standard_libraries[name]
                     completions.append(
                         {
                             "label": name,
@@ -1168,7 +1373,7 @@ class CodeEditor(tk.Frame):
         # --- End Import Assistance ---
 
         try:
-            dot_match = re.search(r"(\b[\w_]+)\.([\w_]*)$", line_text_before_cursor)
+            dot_match = DOT_ACCESS_PATTERN.search(line_text_before_cursor)
             if dot_match:
                 base_word, partial_member = dot_match.group(1), dot_match.group(2)
                 completions = []
@@ -1213,7 +1418,7 @@ class CodeEditor(tk.Frame):
         try:
             current_word = ""
             # Check for decorator pattern first: @ followed by zero or more word characters
-            decorator_match = re.search(r"@\w*$", line_text_before_cursor)
+            decorator_match = DECORATOR_PREFIX_PATTERN.search(line_text_before_cursor)
             if decorator_match:
                 current_word = decorator_match.group(0)
             else:
@@ -1397,7 +1602,7 @@ class CodeEditor(tk.Frame):
         # Helper to check if the completion item is itself a snippet
         def is_snippet(completion_item):
             raw_text = completion_item.get("insert", "")
-            return bool(re.search(r"\$\{\d+:.+?\}", raw_text))
+            return bool(SNIPPET_PLACEHOLDER_PATTERN.search(raw_text))
 
         # Case A: We are in an active snippet session and we are NOT inserting a new snippet.
         # This means we are just filling text into a placeholder.
@@ -1431,8 +1636,10 @@ class CodeEditor(tk.Frame):
             # Determine the start of the word to be replaced with corrected logic.
             replace_start_index_str = self.text_area.index("insert-1c wordstart")
 
-            decorator_match = re.search(r"@\w*$", current_line_before_cursor)
-            dot_match = re.search(r"\b[\w_]+\.([\w_]*)$", current_line_before_cursor)
+            decorator_match = DECORATOR_PREFIX_PATTERN.search(
+                current_line_before_cursor
+            )
+            dot_match = DOT_ACCESS_PATTERN.search(current_line_before_cursor)
 
             if decorator_match:
                 replace_start_index_str = f"insert - {len(decorator_match.group(0))}c"
@@ -1450,7 +1657,7 @@ class CodeEditor(tk.Frame):
 
         self.last_action_was_auto_feature = True
         self.text_area.focus_set()
-        self.after_idle(self._on_content_changed)
+        self._schedule_content_changed()
 
     def _perform_insertion(
         self, item, replace_start_index_str, insert_index_before, start_new_snippet=True
@@ -1458,7 +1665,7 @@ class CodeEditor(tk.Frame):
         current_line_content = self.text_area.get(
             f"{insert_index_before} linestart", f"{insert_index_before} lineend"
         )
-        indent_match = re.match(r"^(\s*)", current_line_content)
+        indent_match = LEADING_WHITESPACE_PATTERN.match(current_line_content)
         indentation = indent_match.group(1) if indent_match else ""
 
         # --- Placeholder Parsing (Robust Two-Pass Method) ---
@@ -1470,14 +1677,13 @@ class CodeEditor(tk.Frame):
         raw_insert_text = raw_insert_text.replace("$0", "")
 
         # Pass 2: Find all numbered placeholders
-        numbered_placeholder_pattern = re.compile(r"\$\{(\d+):(.+?)\}")
-        for match in numbered_placeholder_pattern.finditer(raw_insert_text):
+        for match in SNIPPET_PLACEHOLDER_PATTERN.finditer(raw_insert_text):
             order = int(match.group(1))
             text = match.group(2)
             placeholders.append({"order": order, "text": text})
 
         # Clean the insert string by replacing placeholder syntax with just the text
-        text_to_insert = numbered_placeholder_pattern.sub(r"\2", raw_insert_text)
+        text_to_insert = SNIPPET_PLACEHOLDER_PATTERN.sub(r"\2", raw_insert_text)
 
         # Sort placeholders by their tab-stop order
         placeholders.sort(key=lambda p: p["order"])
@@ -1776,7 +1982,7 @@ class CodeEditor(tk.Frame):
                     current_line = self.text_area.get(
                         line_start, f"{cursor_index} lineend"
                     )
-                    indent_match = re.match(r"^(\s*)", current_line)
+                    indent_match = LEADING_WHITESPACE_PATTERN.match(current_line)
                     base_indent = indent_match.group(1) if indent_match else ""
 
                     inserted_text = f"\n{base_indent}    \n{base_indent}"
@@ -1787,7 +1993,7 @@ class CodeEditor(tk.Frame):
                     self.text_area.mark_set(
                         tk.INSERT, f"{cursor_index}+{len(base_indent)+5}c"
                     )
-                    self.after_idle(self._on_content_changed)
+                    self._schedule_content_changed()
                     return "break"
             except tk.TclError:
                 pass
@@ -1795,7 +2001,7 @@ class CodeEditor(tk.Frame):
             return self._auto_indent(event)
         else:
             self.text_area.insert(tk.INSERT, "\n")
-            self.after_idle(self._on_content_changed)
+            self._schedule_content_changed()
             return "break"
 
     def update_file_path_label(self):
@@ -1811,7 +2017,38 @@ class CodeEditor(tk.Frame):
             pass
         self.file_path_label.config(text=file_path)
 
+    def _is_in_hidden_tab(self) -> bool:
+        """True while the frame holding this editor is not laid out (background tab)."""
+        if isinstance(self.master, (tk.Tk, tk.Toplevel)):
+            return False
+        return not self.master.winfo_manager()
+
+    def _on_tab_shown(self, event=None):
+        if self.content_change_deferred:
+            self._on_content_changed()
+
+    def _schedule_content_changed(self, event=None):
+        """Queues one _on_content_changed for the next idle moment.
+
+        Edits, opening a tab, laying it out and applying the font each ask for
+        a refresh; requests made before the queued one runs are merged into it,
+        so a burst of edits (a paste, an undo, fast typing) re-analyses once.
+        """
+        if self._content_change_after_id is None:
+            self._content_change_after_id = self.after_idle(
+                self._run_scheduled_content_change
+            )
+
+    def _run_scheduled_content_change(self):
+        self._content_change_after_id = None
+        self._on_content_changed()
+
     def _on_content_changed(self, event=None):
+        # Background tabs skip the full re-analysis until they are shown again
+        if self._is_in_hidden_tab():
+            self.content_change_deferred = True
+            return
+        self.content_change_deferred = False
         self.code_analyzer.analyze(self.text_area.get("1.0", tk.END))
         self.apply_syntax_highlighting()
         self._proactive_syntax_check()
@@ -1923,7 +2160,9 @@ class CodeEditor(tk.Frame):
         )
         stripped_line = current_line_content.strip()
 
-        current_indent_str_match = re.match(r"^(\s*)", current_line_content)
+        current_indent_str_match = LEADING_WHITESPACE_PATTERN.match(
+            current_line_content
+        )
         current_indent_str = (
             current_indent_str_match.group(1) if current_indent_str_match else ""
         )
@@ -1932,7 +2171,7 @@ class CodeEditor(tk.Frame):
         for i in range(line_number - 1, 0, -1):
             line = self.text_area.get(f"{i}.0", f"{i}.end")
             if line.strip():
-                indent_match = re.match(r"^(\s*)", line)
+                indent_match = LEADING_WHITESPACE_PATTERN.match(line)
                 parent_indent_str = indent_match.group(1) if indent_match else ""
                 break
 
@@ -1952,7 +2191,7 @@ class CodeEditor(tk.Frame):
         self.text_area.insert(tk.INSERT, f"\n{next_line_indent_str}")
 
         self.last_action_was_auto_feature = True
-        self.after_idle(self._on_content_changed)
+        self._schedule_content_changed()
         return "break"
 
     # In class CodeEditor
@@ -2058,26 +2297,36 @@ class CodeEditor(tk.Frame):
                 self.text_area.tag_remove(tag, "1.0", tk.END)
 
         content = self.text_area.get("1.0", tk.END)
+        self._line_starts = self._compute_line_starts(content)
         # --- Start Regex-based highlighting (fastest) ---
-        for match in re.finditer(r"(#.*)", content):
+        for match in COMMENT_PATTERN.finditer(content):
             self._apply_tag("comment_tag", match.start(), match.end())
-        for pattern in [r"f'''(.*?)'''", r'f"""(.*)"""', r"'''(.*?)'''", r'"""(.*)"""']:
-            for match in re.finditer(pattern, content, re.DOTALL):
+        for pattern in TRIPLE_QUOTED_STRING_PATTERNS:
+            for match in pattern.finditer(content):
                 if not self._is_inside_tag(match.start(), ("comment_tag",)):
                     self._apply_tag("string_literal", match.start(), match.end())
                     if match.group(0).startswith("f"):
-                        for expr in re.finditer(r"\{(.+?)\}", match.group(1)):
+                        for expr in FSTRING_EXPRESSION_PATTERN.finditer(match.group(1)):
                             self._apply_tag(
                                 "fstring_expression",
                                 match.start(1) + expr.start(0),
                                 match.start(1) + expr.end(0),
                             )
-        string_regex = r"""(f?r?|r?f?)b?'[^'\\\n]*(?:\\.[^'\\\n]*)*'|(f?r?|r?f?)b?\"[^\\"\\\n]*(?:\\.[^\\"\\\n]*)*\""""
-        for m in re.finditer(string_regex, content):
+        for m in STRING_PATTERN.finditer(content):
             if not self._is_inside_tag(m.start(), ("comment_tag", "string_literal")):
                 self._apply_tag("string_literal", m.start(), m.end())
 
         self._parse_imports(content)
+        # Hover text is built here, once per edit, instead of on every motion
+        # event over an import
+        self.import_tooltips = {
+            alias: f"User-defined import.\nSource: {source}"
+            for alias, source in self.imported_aliases.items()
+        }
+        self.import_member_tooltips = {
+            alias: f"Member of user-defined import '{alias}'.\nSource: {source}"
+            for alias, source in self.imported_aliases.items()
+        }
 
         for egg in self.easter_egg_tooltips.keys():
             if " " in egg:
@@ -2106,11 +2355,11 @@ class CodeEditor(tk.Frame):
                     self._apply_tag(tag, m.start(), m.end())
 
         # Add new regex patterns for decorators and constants
-        for m in re.finditer(r"@([\w\.]+)", content):
+        for m in DECORATOR_NAME_PATTERN.finditer(content):
             if not self._is_inside_tag(m.start(), ("comment_tag", "string_literal")):
                 self._apply_tag("decorator_tag", m.start(1), m.end(1))
 
-        for m in re.finditer(r"\b([A-Z_][A-Z0-9_]+)\b", content):
+        for m in CONSTANT_NAME_PATTERN.finditer(content):
             if not self._is_inside_tag(m.start(), ("comment_tag", "string_literal")):
                 if m.group(1) not in keyword.kwlist and m.group(1) not in [
                     "True",
@@ -2119,28 +2368,15 @@ class CodeEditor(tk.Frame):
                 ]:
                     self._apply_tag("constant_tag", m.start(), m.end())
 
-        static_patterns = {
-            r"\bdef\b": "def_keyword",
-            r"\bclass\b": "class_keyword",
-            r"\b(if|else|elif)\b": "keyword_conditional",
-            r"\b(for|while|break|continue)\b": "keyword_loop",
-            r"\b(return|yield)\b": "keyword_return",
-            r"\b(pass|global|nonlocal|del)\b": "keyword_structure",
-            r"\b(import|from|as)\b": "keyword_import",
-            r"\b(try|except|finally|raise|assert)\b": "keyword_exception",
-            r"\b(True|False|None)\b": "keyword_boolean_null",
-            r"\b(and|or|not|in|is)\b": "keyword_logical",
-            r"\b(async|await)\b": "keyword_async",
-            r"\b(with|lambda)\b": "keyword_context",
-            r"\bPriesty\b": "priesty_keyword",
-            r"\bself\b": "self_keyword",
-            r"\b(" + "|".join(self.builtin_list) + r")\b": "builtin_function",
-            r"\b(" + "|".join(self.exception_list) + r")\b": "exception_type",
-            r"[(){}[\]]": "bracket_tag",
-            r"\b(__init__|__str__|__repr__)\b": "dunder_method",
-        }
-        for pattern, tag in static_patterns.items():
-            for m in re.finditer(pattern, content):
+        static_patterns = (
+            *KEYWORD_HIGHLIGHT_PATTERNS,
+            (self._builtin_pattern, "builtin_function"),
+            (self._exception_pattern, "exception_type"),
+            (BRACKET_PATTERN, "bracket_tag"),
+            (DUNDER_METHOD_PATTERN, "dunder_method"),
+        )
+        for pattern, tag in static_patterns:
+            for m in pattern.finditer(content):
                 if not self._is_inside_tag(
                     m.start(),
                     (
@@ -2168,7 +2404,7 @@ class CodeEditor(tk.Frame):
                     ):
                         self._apply_tag("custom_import_member", m.start(1), m.end(1))
 
-        for m in re.finditer(r"\bself\.([\w]+)\b", content):
+        for m in SELF_MEMBER_PATTERN.finditer(content):
             if not self._is_inside_tag(m.start(1), ("comment_tag", "string_literal")):
                 self._apply_tag("self_method_call", m.start(1), m.end(1))
         defs = self.code_analyzer.get_definitions()
@@ -2191,10 +2427,7 @@ class CodeEditor(tk.Frame):
                         m.start(), ("comment_tag", "string_literal", def_tag)
                     ):
                         self._apply_tag(usage_tag, m.start(), m.end())
-        for m in re.finditer(
-            r"\b(0[xX][0-9a-fA-F]+|0[oO][0-7]+|0[bB][01]+|\d+(\.\d*)?([eE][+-]?\d+)?)\b",
-            content,
-        ):
+        for m in NUMBER_PATTERN.finditer(content):
             if not self._is_inside_tag(m.start(), ("comment_tag", "string_literal")):
                 self._apply_tag("number_literal", m.start(), m.end())
 
@@ -2232,7 +2465,7 @@ class CodeEditor(tk.Frame):
     def _is_inside_tag_indices(self, index, tag_names):
         """Checks if a given tk index is inside any of the specified tags."""
         try:
-            return any(tag in self.text_area.tag_names(index) for tag in tag_names)
+            return not set(self.text_area.tag_names(index)).isdisjoint(tag_names)
         except tk.TclError:
             return False
 
@@ -2262,16 +2495,14 @@ class CodeEditor(tk.Frame):
 
     def _parse_imports_regex(self, content):
         self.imported_aliases.clear()
-        for m in re.finditer(r"^\s*import\s+([^\n]+)", content, re.MULTILINE):
-            for part in re.split(r"\s*,\s*", m.group(1).split("#")[0].strip()):
+        for m in IMPORT_STATEMENT_PATTERN.finditer(content):
+            for part in COMMA_SEPARATOR_PATTERN.split(m.group(1).split("#")[0].strip()):
                 if " as " in part:
-                    real, alias = re.split(r"\s+as\s+", part, 1)
+                    real, alias = AS_SEPARATOR_PATTERN.split(part, 1)
                     self.imported_aliases[alias.strip()] = real.strip()
                 else:
                     self.imported_aliases[part.strip()] = part.strip()
-        for m in re.finditer(
-            r"^\s*from\s+([\w.]+)\s+import\s+([^\n]+)", content, re.MULTILINE
-        ):
+        for m in FROM_IMPORT_STATEMENT_PATTERN.finditer(content):
             source, names_str = m.group(1).strip(), m.group(2).strip().split("#")[
                 0
             ].strip().replace("\\", "")
@@ -2282,32 +2513,53 @@ class CodeEditor(tk.Frame):
                     "from __future__ import braces"
                 )
                 continue
-            for part in re.split(r"\s*,\s*", names_str):
+            for part in COMMA_SEPARATOR_PATTERN.split(names_str):
                 part = part.strip()
                 if not part:
                     continue
                 if " as " in part:
-                    real, alias = re.split(r"\s+as\s+", part, 1)
+                    real, alias = AS_SEPARATOR_PATTERN.split(part, 1)
                     self.imported_aliases[alias.strip()] = f"{source}.{real.strip()}"
                 else:
                     self.imported_aliases[part] = f"{source}.{part}"
 
+    @staticmethod
+    def _compute_line_starts(content):
+        """Returns the offset at which each line of content begins."""
+        line_starts = [0]
+        newline = content.find("\n")
+        while newline != -1:
+            line_starts.append(newline + 1)
+            newline = content.find("\n", newline + 1)
+        return line_starts
+
+    def _offset_to_index(self, offset):
+        """Converts a character offset in the highlighted content to line.col.
+
+        Tk resolves "1.0 + N chars" by walking forward from the first line,
+        which made every tag lookup cost more the further down the file it
+        was; a bisect over the line starts is logarithmic instead.
+        """
+        line = bisect.bisect_right(self._line_starts, offset)
+        return f"{line}.{offset - self._line_starts[line - 1]}"
+
     def _apply_tag(self, tag_name, start_offset, end_offset):
         try:
             self.text_area.tag_add(
-                tag_name, f"1.0 + {start_offset} chars", f"1.0 + {end_offset} chars"
+                tag_name,
+                self._offset_to_index(start_offset),
+                self._offset_to_index(end_offset),
             )
         except tk.TclError:
             pass
 
     def _is_inside_tag(self, offset, tag_names):
+        # One tag_names call per check, rather than one per tag name
         try:
-            return any(
-                tag in self.text_area.tag_names(f"1.0 + {offset} chars")
-                for tag in tag_names
-            )
+            tags = self.text_area.tag_names(self._offset_to_index(offset))
         except tk.TclError:
             return False
+        return not set(tags).isdisjoint(tag_names)
 
     # In class CodeEditor
     def _proactive_syntax_check(self):
@@ -2543,6 +2795,10 @@ class CodeEditor(tk.Frame):
             "antigravity": "Opens a webcomic about Python.",
             "from __future__ import braces": "April Fool's joke. Raises a SyntaxError: not a chance.",
         }
+        # (egg, tooltip) pairs matched against the whole hovered line
+        self.multi_word_easter_eggs = [
+            (egg, text) for egg, text in self.easter_egg_tooltips.items() if " " in egg
+        ]
 
         self.standard_libraries = {
             "os": {
@@ -2746,6 +3002,18 @@ class CodeEditor(tk.Frame):
         }
 
         self.builtin_list = list(self.builtin_tooltips.keys())
+        self._builtin_pattern = re.compile(
+            r"\b(" + "|".join(self.builtin_list) + r")\b"
+        )
+        self._exception_pattern = re.compile(
+            r"\b(" + "|".join(self.exception_list) + r")\b"
+        )
+        # Prefix filtering for except/import completions only scans the names
+        # sharing the typed first letter
+        self._exceptions_by_first_letter = _group_by_first_letter(self.exception_list)
+        self._libraries_by_first_letter = _group_by_first_letter(
+            self.standard_libraries
+        )
 
         self.raw_keywords = []
         keyword_set = set(keyword.kwlist)
@@ -3166,10 +3434,8 @@ class CodeEditor(tk.Frame):
             word = self.text_area.get(
                 f"@{event.x},{event.y} wordstart", f"@{event.x},{event.y} wordend"
             )
-            if word in self.imported_aliases:
-                source = self.imported_aliases[word]
-                tooltip_text = f"User-defined import.\nSource: {source}"
-                self._show_tooltip(event, tooltip_text)
+            if word in self.import_tooltips:
+                self._show_tooltip(event, self.import_tooltips[word])
         except tk.TclError:
             pass
 
@@ -3179,17 +3445,16 @@ class CodeEditor(tk.Frame):
             current_word = self.text_area.get(f"{index} wordstart", f"{index} wordend")
             line_text = self.text_area.get(f"{index} linestart", f"{index} lineend")
 
+            # index is "@x,y"; the column comes from the resolved "line.col"
+            cursor_offset = int(self.text_area.index(index).split(".")[1])
             for match in re.finditer(r"(\b\w+)\." + re.escape(current_word), line_text):
                 start_char_offset = match.start()
                 end_char_offset = match.end()
-                cursor_offset = int(index.split(".")[1])
 
                 if start_char_offset <= cursor_offset <= end_char_offset:
                     alias = match.group(1)
-                    if alias in self.imported_aliases:
-                        source = self.imported_aliases[alias]
-                        tooltip_text = f"Member of user-defined import '{alias}'.\nSource: {source}"
-                        self._show_tooltip(event, tooltip_text)
+                    if alias in self.import_member_tooltips:
+                        self._show_tooltip(event, self.import_member_tooltips[alias])
                         break
         except tk.TclError:
             pass
@@ -3223,9 +3488,9 @@ class CodeEditor(tk.Frame):
             # Check for multi-word easter eggs
             line_start = self.text_area.index(f"{index} linestart")
             line_text = self.text_area.get(line_start, f"{line_start} lineend")
-            for egg in self.easter_egg_tooltips:
-                if " " in egg and egg in line_text:
-                    self._show_tooltip(event, self.easter_egg_tooltips[egg])
+            for egg, tooltip_text in self.multi_word_easter_eggs:
+                if egg in line_text:
+                    self._show_tooltip(event, tooltip_text)
                     return
 
             if word in self.easter_egg_tooltips:
@@ -3310,10 +3575,9 @@ class CodeEditor(tk.Frame):
             return  # Don't show tooltip when autocomplete is up
 
         if event:
-            x, y = (
-                self.winfo_rootx() + self.text_area.winfo_x() + event.x + 20,
-                self.winfo_rooty() + self.text_area.winfo_y() + event.y + 20,
-            )
+            # The event already carries screen coordinates; no winfo queries
+            # are needed on every mouse move
+            x, y = event.x_root + 20, event.y_root + 20
         elif bbox:
             x, y = (
                 self.winfo_rootx() + self.text_area.winfo_x() + bbox[0],
@@ -3321,12 +3585,21 @@ class CodeEditor(tk.Frame):
             )
         else:
             return
-        self.tooltip_label.config(text=text)
+        # Moving within the same word only repositions the shown tooltip
+        was_hidden = self._tooltip_text is None
+        if text != self._tooltip_text:
+            self.tooltip_label.config(text=text)
+            self._tooltip_text = text
         self.tooltip_window.wm_geometry(f" +{int(x)}+{int(y)}")
-        self.tooltip_window.wm_deiconify()
+        if was_hidden:
+            self.tooltip_window.wm_deiconify()
 
     def _hide_tooltip(self, event=None):
+        # Called on most key releases, so skip the Tk call when already hidden
+        if self._tooltip_text is None:
+            return
         self.tooltip_window.wm_withdraw()
+        self._tooltip_text = None
 
     def _show_signature_help(self):
         try:
@@ -3386,25 +3659,7 @@ class CodeEditor(tk.Frame):
         if not event:
             return
 
-        ignored_keys = {
-            "Up",
-            "Down",
-            "Left",
-            "Right",
-            "Return",
-            "Tab",
-            "Escape",
-            "period",
-            "Shift_L",
-            "Shift_R",
-            "Control_L",
-            "Control_R",
-            "Alt_L",
-            "Alt_R",
-            "Super_L",
-            "Super_R",
-        }
-        if event.keysym in ignored_keys:
+        if event.keysym in KEY_RELEASE_IGNORED_KEYS:
             return
 
         self._on_release_or_click()
@@ -3467,8 +3722,9 @@ class CodeEditor(tk.Frame):
 
     def _on_text_modified(self, event=None):
         if self.text_area.edit_modified():
+            self.has_unsaved_changes = True
             self.text_area.event_generate("<<Change>>")
-            self._on_content_changed()
+            self._schedule_content_changed()
             self.text_area.edit_modified(False)
 
     def _update_bracket_matching(self):
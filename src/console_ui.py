@@ -11,6 +11,8 @@ class ConsoleUi(ttk.Frame):
         self.jump_callback = jump_callback
         self.error_map = {}  # Maps treeview item ID to full error details
         self.tooltip_window = None
+        self.tooltip_label = None
+        self.tooltip_item = None  # Row whose details the tooltip is showing
 
         self.grid_columnconfigure(0, weight=1)
         self.grid_rowconfigure(0, weight=1)
@@ -39,45 +41,50 @@ class ConsoleUi(ttk.Frame):
 
     def _on_hover(self, event):
         item_id = self.tree.identify_row(event.y)
-        if item_id and item_id in self.error_map:
-            details = self.error_map[item_id].get("details", "No details available.")
-            self._show_tooltip(event, details)
-        else:
+        if item_id not in self.error_map:
             self._hide_tooltip()
+            return
+        if item_id == self.tooltip_item:
+            # Still over the same row; the tooltip only follows the pointer
+            self.tooltip_window.wm_geometry(f"+{event.x_root + 20}+{event.y_root + 10}")
+            return
+        details = self.error_map[item_id].get("details", "No details available.")
+        self._show_tooltip(event, details)
+        self.tooltip_item = item_id
 
     def _on_leave(self, event):
         self._hide_tooltip()
 
     def _show_tooltip(self, event, text):
-        if self.tooltip_window:
-            self.tooltip_window.destroy()
-
-        x = self.winfo_pointerx() + 20
-        y = self.winfo_pointery() + 10
-
-        self.tooltip_window = tk.Toplevel(self)
-        self.tooltip_window.wm_overrideredirect(True)
+        x = event.x_root + 20
+        y = event.y_root + 10
+
+        # One window is created on first use and then only moved, relabelled
+        # and withdrawn, instead of being rebuilt on every mouse move
+        if self.tooltip_window is None:
+            self.tooltip_window = tk.Toplevel(self)
+            self.tooltip_window.wm_overrideredirect(True)
+            self.tooltip_label = tk.Label(
+                self.tooltip_window,
+                justify="left",
+                background="#3C3C3C",
+                foreground="white",
+                relief="solid",
+                borderwidth=1,
+                wraplength=500,
+                font=("Consolas", 9),
+                padx=4,
+                pady=4,
+            )
+            self.tooltip_label.pack(ipadx=1)
+        self.tooltip_label.config(text=text)
         self.tooltip_window.wm_geometry(f"+{x}+{y}")
-
-        label = tk.Label(
-            self.tooltip_window,
-            text=text,
-            justify="left",
-            background="#3C3C3C",
-            foreground="white",
-            relief="solid",
-            borderwidth=1,
-            wraplength=500,
-            font=("Consolas", 9),
-            padx=4,
-            pady=4,
-        )
-        label.pack(ipadx=1)
+        self.tooltip_window.deiconify()
 
     def _hide_tooltip(self):
-        if self.tooltip_window:
-            self.tooltip_window.destroy()
-            self.tooltip_window = None
+        if self.tooltip_window and self.tooltip_item is not None:
+            self.tooltip_window.withdraw()
+        self.tooltip_item = None
 
     def _on_double_click(self, event):
         item_id = self.tree.focus()
@@ -139,8 +146,9 @@ class ConsoleUi(ttk.Frame):
         else:  # Clear all
             items_to_delete = list(self.error_map.keys())
 
+        # Every id in error_map is a live row (rows are only removed here), so
+        # they can all go in a single Tcl call
+        if items_to_delete:
+            self.tree.delete(*items_to_delete)
         for item_id in items_to_delete:
-            if self.tree.exists(item_id):
-                self.tree.delete(item_id)
-            if item_id in self.error_map:
-                del self.error_map[item_id]
+            del self.error_map[item_id]
@@ -2,10 +2,35 @@
 
 import tkinter as tk
 from tkinter import ttk, messagebox, simpledialog, filedialog
+import functools
 import os
 import shutil
 import sys
 import subprocess
+import threading
+
+# Text of the dummy child that marks a folder as not yet listed
+PLACEHOLDER_TEXT = "Loading..."
+# Rows inserted per idle callback when listing a large folder, so the first
+# screenful paints before the rest of the folder is added
+INSERT_CHUNK_SIZE = 200
+# At most this many folder scans read the disk at once; restoring a tree with
+# many expanded folders would otherwise hit it from every thread together.
+# Scans run on daemon threads so a hung network drive can't block exit.
+SCAN_SLOTS = threading.BoundedSemaphore(4)
+# Delay (ms) before a requested refresh runs, so a burst of file operations
+# relists the tree once
+REFRESH_DEBOUNCE_MS = 100
+# Files shown with the git icon (unless their extension has an icon of its own)
+GIT_FILE_NAMES = frozenset({".gitignore", ".gitattributes", ".gitmodules", "readme.md"})
+# Options shared by the explorer's context menus
+MENU_STYLE = {
+    "tearoff": 0,
+    "bg": "#3C3C3C",
+    "fg": "white",
+    "activebackground": "#555555",
+    "activeforeground": "white",
+}
 
 
 class FileExplorer(tk.Frame):
@@ -26,6 +51,9 @@ class FileExplorer(tk.Frame):
         self.parent = parent  # The main PriestyCode instance
         self.project_root = project_root
         self.open_file_callback = open_file_callback
+        # Bumped per listing so chunks left over from an older listing stop
+        self._listing_generation = 0
+        self._refresh_after_id = None
 
         self.folder_icon = folder_icon
         self.python_icon = python_icon
@@ -33,18 +61,17 @@ class FileExplorer(tk.Frame):
         self.unknown_icon = unknown_icon
         self.txt_icon = txt_icon
         self.md_icon = md_icon
+        # One lookup per listed file instead of a chain of comparisons
+        self._extension_icons = {".py": python_icon, ".txt": txt_icon, ".md": md_icon}
 
         self.tree = ttk.Treeview(self, show="tree", selectmode="browse")
         self.tree.pack(fill="both", expand=True, padx=5, pady=5)
 
-        self.context_menu = tk.Menu(
-            self.tree,
-            tearoff=0,
-            bg="#3C3C3C",
-            fg="white",
-            activebackground="#555555",
-            activeforeground="white",
-        )
+        # Context menus are built once per kind on first use; their commands
+        # act on the item and folder recorded at right-click time
+        self._context_menus: dict[str, tk.Menu] = {}
+        self._menu_item = None
+        self._menu_target_dir = None
         self.tree.bind("<Button-3>", self._show_context_menu)
 
         self.drag_data = {"item": None, "x": 0, "y": 0}
@@ -53,40 +80,26 @@ class FileExplorer(tk.Frame):
         self.tree.bind("<ButtonRelease-1>", self._on_b1_release)
 
         self.tree.bind("<Double-1>", self._on_double_click)
-
-        self.style = ttk.Style()
-        self.style.configure(
-            "Treeview",
-            background="#2B2B2B",
-            foreground="white",
-            fieldbackground="#2B2B2B",
-            bordercolor="#2B2B2B",
-            font=("Segoe UI", 9),
-        )
-        self.style.map(
-            "Treeview",
-            background=[("selected", "#555555")],
-            foreground=[("selected", "white")],
-        )
-        self.style.configure(
-            "Treeview.Heading",
-            background="#3C3C3C",
-            foreground="white",
-            font=("Segoe UI", 9, "bold"),
-        )
-        self.style.layout("Treeview", [("Treeview.treearea", {"sticky": "nswe"})])
+        self.tree.bind("<<TreeviewOpen>>", self._on_tree_open)
 
     def set_project_root(self, path):
         self.project_root = path
         self.populate_tree()
 
     def populate_tree(self):
-        open_items = {
-            item for item in self.tree.get_children("") if self.tree.item(item, "open")
-        }
+        """Schedules a relisting of the tree, coalescing rapid requests."""
+        if self._refresh_after_id is not None:
+            self.after_cancel(self._refresh_after_id)
+        self._refresh_after_id = self.after(
+            REFRESH_DEBOUNCE_MS, self._populate_tree_now
+        )
 
-        for i in self.tree.get_children():
-            self.tree.delete(i)
+    def _populate_tree_now(self):
+        self._refresh_after_id = None
+        open_items = self._get_open_items()
+        self._listing_generation += 1
+
+        self.tree.delete(*self.tree.get_children())
 
         root_name = os.path.basename(self.project_root) or self.project_root
 
@@ -96,142 +109,209 @@ class FileExplorer(tk.Frame):
             "iid": self.project_root,
             "text": root_name,
             "tags": ("folder",),
+            "open": True,
         }
         if self.folder_icon:
             insert_kwargs["image"] = self.folder_icon
 
         root_node = self.tree.insert(**insert_kwargs)
-        self.tree.item(root_node, open=True)
         self._add_nodes(root_node, self.project_root, open_items)
 
+    def _get_open_items(self):
+        # Only folders can be open, and one tag query lists all of them, so
+        # file rows are never visited
+        return {
+            item for item in self.tree.tag_has("folder") if self.tree.item(item, "open")
+        }
+
+    def _on_tree_open(self, event=None):
+        item_id = self.tree.focus()
+        children = self.tree.get_children(item_id)
+        if len(children) == 1 and self.tree.tag_has("placeholder", children[0]):
+            # Kept visible until the listing arrives; retagged so reopening
+            # the folder meanwhile does not start a second scan
+            self.tree.item(children[0], tags=("loading",))
+            self._add_nodes(item_id, item_id, set())
+
     def _add_nodes(self, parent_node, path, open_items):
+        """Lists one directory level; subfolders are filled in when opened.
+
+        The folder is read and sorted on a worker thread (slow disks and
+        network drives no longer freeze the UI); only the inserts run here.
+        """
+        threading.Thread(
+            target=self._scan_directory,
+            args=(parent_node, path, open_items, self._listing_generation),
+            daemon=True,
+        ).start()
+
+    def _scan_directory(self, parent_node, path, open_items, generation):
         try:
-            items = sorted(
-                os.listdir(path),
-                key=lambda x: (not os.path.isdir(os.path.join(path, x)), x.lower()),
-            )
-            for item in items:
-                full_path = os.path.join(path, item)
-                if os.path.isdir(full_path):
-                    insert_kwargs = {
-                        "parent": parent_node,
-                        "index": "end",
-                        "iid": full_path,
-                        "text": item,
-                        "tags": ("folder",),
-                    }
-                    if self.folder_icon:
-                        insert_kwargs["image"] = self.folder_icon
-
-                    node = self.tree.insert(**insert_kwargs)
-                    if full_path in open_items:
-                        self.tree.item(node, open=True)
-                    self._add_nodes(node, full_path, open_items)
-                else:
-                    file_extension = os.path.splitext(item)[1].lower()
-                    icon = self.unknown_icon
-                    if file_extension == ".py":
-                        icon = self.python_icon
-                    elif file_extension == ".txt":
-                        icon = self.txt_icon
-                    elif file_extension == ".md":
-                        icon = self.md_icon
-                    elif item.lower() in [
-                        ".gitignore",
-                        ".gitattributes",
-                        ".gitmodules",
-                        "readme.md",
-                    ]:
-                        icon = self.git_icon
-
-                    insert_kwargs = {
-                        "parent": parent_node,
-                        "index": "end",
-                        "iid": full_path,
-                        "text": item,
-                        "tags": ("file_item",),
-                    }
-                    if icon:
-                        insert_kwargs["image"] = icon
-                    self.tree.insert(**insert_kwargs)
+            with SCAN_SLOTS, os.scandir(path) as it:
+                entries = sorted(it, key=lambda e: (not e.is_dir(), e.name.lower()))
         except Exception as e:
             print(f"Error reading directory {path}: {e}")
+            entries = []
+        try:
+            self.after(
+                0, self._insert_entries, parent_node, entries, open_items, 0, generation
+            )
+        except RuntimeError as e:
+            # The window was closed while the folder was being read
+            print(f"Error listing directory {path}: {e}")
+
+    def _insert_entries(self, parent_node, entries, open_items, start, generation):
+        """Inserts one chunk of entries and schedules the next one."""
+        if generation != self._listing_generation:
+            return
+        end = start + INSERT_CHUNK_SIZE
+        try:
+            if start == 0:
+                loading = [
+                    child
+                    for child in self.tree.get_children(parent_node)
+                    if self.tree.tag_has("loading", child)
+                ]
+                if loading:
+                    self.tree.delete(*loading)
+            for entry in entries[start:end]:
+                self._insert_entry(parent_node, entry, open_items)
+        except Exception as e:
+            print(f"Error listing directory {parent_node}: {e}")
+            return
+        if end < len(entries):
+            self.after_idle(
+                self._insert_entries, parent_node, entries, open_items, end, generation
+            )
+
+    def _insert_entry(self, parent_node, entry, open_items):
+        item = entry.name
+        full_path = entry.path
+        if entry.is_dir():
+            insert_kwargs = {
+                "parent": parent_node,
+                "index": "end",
+                "iid": full_path,
+                "text": item,
+                "tags": ("folder",),
+                # Set at insert time rather than with a second item() call
+                "open": full_path in open_items,
+            }
+            if self.folder_icon:
+                insert_kwargs["image"] = self.folder_icon
+
+            node = self.tree.insert(**insert_kwargs)
+            if full_path in open_items:
+                self._add_nodes(node, full_path, open_items)
+            else:
+                # Gives the folder an expand arrow until it is opened
+                self.tree.insert(
+                    node, "end", text=PLACEHOLDER_TEXT, tags=("placeholder",)
+                )
+        else:
+            file_extension = os.path.splitext(item)[1].lower()
+            if file_extension in self._extension_icons:
+                icon = self._extension_icons[file_extension]
+            elif item.lower() in GIT_FILE_NAMES:
+                icon = self.git_icon
+            else:
+                icon = self.unknown_icon
+
+            insert_kwargs = {
+                "parent": parent_node,
+                "index": "end",
+                "iid": full_path,
+                "text": item,
+                "tags": ("file_item",),
+            }
+            if icon:
+                insert_kwargs["image"] = icon
+            self.tree.insert(**insert_kwargs)
 
     def _show_context_menu(self, event):
         item_id = self.tree.identify_row(event.y)
         if item_id:
             self.tree.selection_set(item_id)
 
-        self.context_menu.delete(0, "end")
-
-        is_file = item_id and os.path.isfile(item_id)
-        is_dir = item_id and os.path.isdir(item_id)
+        # The tags set while listing already record the item's kind, so no
+        # filesystem calls are needed on every right-click
+        if item_id and self.tree.tag_has("file_item", item_id):
+            kind = "py_file" if item_id.endswith(".py") else "file"
+        elif item_id and self.tree.tag_has("folder", item_id):
+            kind = "folder"
+        elif not item_id:  # Clicked on empty space
+            kind = "empty"
+        else:  # "Loading..." rows have no actions
+            return
 
-        if is_file and item_id.endswith(".py"):
-            self.context_menu.add_command(
-                label="Run", command=lambda: self._run_item(item_id)
+        self._menu_item = item_id
+        self._menu_target_dir = item_id if kind == "folder" else self.project_root
+        menu = self._get_context_menu(kind)
+        try:
+            menu.tk_popup(event.x_root, event.y_root)
+        finally:
+            menu.grab_release()
+
+    def _get_context_menu(self, kind):
+        """Returns the context menu for kind, building it on first use."""
+        menu = self._context_menus.get(kind)
+        if menu is not None:
+            return menu
+
+        menu = tk.Menu(self.tree, **MENU_STYLE)
+        if kind == "py_file":
+            menu.add_command(
+                label="Run", command=lambda: self._run_item(self._menu_item)
             )
-            self.context_menu.add_separator()
+            menu.add_separator()
 
-        if is_file or is_dir:
-            self.context_menu.add_command(
-                label="Rename...", command=lambda: self._rename_item(item_id)
+        if kind != "empty":
+            menu.add_command(
+                label="Rename...", command=lambda: self._rename_item(self._menu_item)
             )
-            self.context_menu.add_command(
-                label="Move...", command=lambda: self.move_item(item_id)
+            menu.add_command(
+                label="Move...", command=lambda: self.move_item(self._menu_item)
             )
-            self.context_menu.add_command(
-                label="Delete", command=lambda: self._delete_item(item_id)
+            menu.add_command(
+                label="Delete", command=lambda: self._delete_item(self._menu_item)
             )
-            self.context_menu.add_separator()
-            self.context_menu.add_command(
+            menu.add_separator()
+            menu.add_command(
                 label="Reveal in File Explorer",
-                command=lambda: self._open_in_explorer(item_id),
+                command=lambda: self._open_in_explorer(self._menu_item),
             )
 
-        target_dir = None
-        if is_dir:
-            target_dir = item_id
-        elif not item_id:  # Clicked on empty space
-            target_dir = self.project_root
-
-        if target_dir:
-            if self.context_menu.index("end") is not None:
-                self.context_menu.add_separator()
-
-            new_menu = tk.Menu(
-                self.context_menu,
-                tearoff=0,
-                bg="#3C3C3C",
-                fg="white",
-                activebackground="#555555",
-                activeforeground="white",
-            )
-            new_menu.add_command(
+        if kind in ("folder", "empty"):
+            if menu.index("end") is not None:
+                menu.add_separator()
+
+            new_file_menu = tk.Menu(menu, **MENU_STYLE)
+            new_file_menu.add_command(
                 label="Python File (.py)",
-                command=lambda: self._create_new_file(target_dir, ".py"),
+                command=functools.partial(self._create_file_in_menu_target, ".py"),
             )
-            new_menu.add_command(
+            new_file_menu.add_command(
                 label="Markdown File (.md)",
-                command=lambda: self._create_new_file(
-                    target_dir, ".md", "# New Markdown File\n"
+                command=functools.partial(
+                    self._create_file_in_menu_target, ".md", "# New Markdown File\n"
                 ),
             )
-            new_menu.add_command(
+            new_file_menu.add_command(
                 label="Text File (.txt)",
-                command=lambda: self._create_new_file(target_dir, ".txt"),
+                command=functools.partial(self._create_file_in_menu_target, ".txt"),
             )
 
-            self.context_menu.add_cascade(label="New File...", menu=new_menu)
-            self.context_menu.add_command(
-                label="New Folder", command=lambda: self._create_new_folder(target_dir)
+            menu.add_cascade(label="New File...", menu=new_file_menu)
+            menu.add_command(
+                label="New Folder",
+                command=lambda: self._create_new_folder(self._menu_target_dir),
             )
 
-        if self.context_menu.index("end") is not None:
-            try:
-                self.context_menu.tk_popup(event.x_root, event.y_root)
-            finally:
-                self.context_menu.grab_release()
+        self._context_menus[kind] = menu
+        return menu
+
+    def _create_file_in_menu_target(self, extension, default_content=""):
+        self._create_new_file(self._menu_target_dir, extension, default_content)
 
     def _create_new_file(self, target_dir, extension, default_content=""):
         name = simpledialog.askstring(
@@ -322,35 +402,74 @@ class FileExplorer(tk.Frame):
         ):
             return
 
+        if os.path.isdir(item_id):
+            # Removing a large folder can take seconds, so it runs off the
+            # Tk thread and the tree refreshes once it is done
+            threading.Thread(
+                target=self._delete_folder, args=(item_id,), daemon=True
+            ).start()
+            return
+
         try:
             if os.path.isfile(item_id):
                 os.remove(item_id)
-            elif os.path.isdir(item_id):
-                shutil.rmtree(item_id)
-
-            self.parent.handle_file_delete(item_id)
-            self.populate_tree()
+            self._finish_delete(item_id)
         except OSError as e:
             messagebox.showerror("Delete Failed", f"Could not delete item: {e}")
 
+    def _delete_folder(self, item_id):
+        try:
+            shutil.rmtree(item_id)
+        except OSError as e:
+            self.after(
+                0, messagebox.showerror, "Delete Failed", f"Could not delete item: {e}"
+            )
+            # Part of the folder may already be gone
+            self.after(0, self.populate_tree)
+            return
+        self.after(0, self._finish_delete, item_id)
+
+    def _finish_delete(self, item_id):
+        self.parent.handle_file_delete(item_id)
+        self.populate_tree()
+
     def _run_item(self, item_id):
         self.parent.run_file_from_explorer(item_id)
 
     def _open_in_explorer(self, item_id):
         path = os.path.dirname(item_id) if os.path.isfile(item_id) else item_id
-        try:
-            if sys.platform == "win32":
+        if sys.platform == "win32":
+            try:
                 os.startfile(path)
-            elif sys.platform == "darwin":
-                subprocess.run(["open", path], check=True)
-            else:
-                subprocess.run(["xdg-open", path], check=True)
+            except Exception as e:
+                messagebox.showerror("Error", f"Could not open file explorer: {e}")
+            return
+        command = ["open", path] if sys.platform == "darwin" else ["xdg-open", path]
+        threading.Thread(
+            target=self._run_open_command, args=(command,), daemon=True
+        ).start()
+
+    def _run_open_command(self, command):
+        """Waits for the platform opener off the Tk thread; it can be slow."""
+        try:
+            subprocess.run(command, check=True)
         except Exception as e:
-            messagebox.showerror("Error", f"Could not open file explorer: {e}")
+            self.after(
+                0,
+                messagebox.showerror,
+                "Error",
+                f"Could not open file explorer: {e}",
+            )
+
+    def _is_path_row(self, item_id):
+        """Whether a row's iid is a real path, unlike a placeholder row's."""
+        return self.tree.tag_has("file_item", item_id) or self.tree.tag_has(
+            "folder", item_id
+        )
 
     def _on_b1_press(self, event):
         item = self.tree.identify_row(event.y)
-        if item:
+        if item and self._is_path_row(item):
             self.drag_data["item"] = item
             self.drag_data["x"] = event.x
             self.drag_data["y"] = event.y
@@ -370,7 +489,11 @@ class FileExplorer(tk.Frame):
             return
 
         drop_target_id = self.tree.identify_row(event.y)
-        if not drop_target_id or drag_item == drop_target_id:
+        if (
+            not drop_target_id
+            or drag_item == drop_target_id
+            or not self._is_path_row(drop_target_id)
+        ):
             return
 
         if self._execute_move(drag_item, drop_target_id):
@@ -417,5 +540,5 @@ class FileExplorer(tk.Frame):
             return
         item_id = selection[0]
 
-        if os.path.isfile(item_id):
+        if self.tree.tag_has("file_item", item_id):
             self.open_file_callback(item_id)
@@ -2,6 +2,11 @@
 
 import tkinter as tk
 from tkinter import messagebox, filedialog, ttk, simpledialog
+import asyncio
+import codecs
+import collections
+import concurrent.futures
+import io
 import os
 import subprocess
 import sys
@@ -10,7 +15,7 @@ from PIL import Image, ImageTk
 import threading
 import queue
 import time
-from typing import cast, Union
+from typing import Union
 import re
 import shutil
 import json
@@ -20,12 +25,12 @@ try:
     from code_editor import CodeEditor
     from console_ui import ConsoleUi
     from terminal import Terminal
-    from file_explorer import FileExplorer
+    from file_explorer import FileExplorer, MENU_STYLE
 except Exception:
     from src.code_editor import CodeEditor
     from src.console_ui import ConsoleUi
     from src.terminal import Terminal
-    from src.file_explorer import FileExplorer
+    from src.file_explorer import FileExplorer, MENU_STYLE
 
 # --- Core Application Paths ---
 current_dir = os.path.dirname(__file__)
@@ -40,6 +45,201 @@ SETTINGS_PATH = os.path.join(_settings_dir, "settings.json")
 
 PROCESS_END_SIGNAL = "<<ProcessEnd>>"
 PROCESS_ERROR_SIGNAL = "<<ProcessError>>"
+# Queued once a stopped run's process has been terminated; its payload says
+# whether the process had to be killed
+PROCESS_STOPPED_SIGNAL = "<<ProcessStopped>>"
+# Queued on a run's stdin queue once its process has exited (or it is
+# stopped) to end that run's writer
+STDIN_CLOSE_SIGNAL = None
+# Maximum number of queued output items handled per UI tick
+OUTPUT_BATCH_LIMIT = 1000
+# Poll interval (ms) of the output queue while a run is active. The run loop
+# thread can't wake the Tk thread itself: any Tk call from it blocks until
+# the Tk thread is free, so it only appends to the queue
+OUTPUT_POLL_MS = 50
+# Poll interval (ms) of the output queue while nothing is running
+OUTPUT_IDLE_POLL_MS = 500
+# Bytes requested per read from a running process's stdout/stderr; reads
+# return whatever is already buffered, so this only caps burst sizes
+STREAM_READ_SIZE = 64 * 1024
+# Seconds closing the IDE waits for a stopped run to exit before killing it
+CLOSE_STOP_TIMEOUT = 3
+# Keeps console programs from opening a window of their own on Windows
+NO_WINDOW_FLAGS = subprocess.CREATE_NO_WINDOW if sys.platform == "win32" else 0
+# Script that runs user programs in a pre-started interpreter
+RUN_WORKER_PATH = os.path.join(current_dir, "run_worker.py")
+# Filename reported in tracebacks for sandbox code run from source
+INLINE_RUN_FILENAME = "<string>"
+# Only the tail of a run's stdout/stderr is kept for error reporting
+RUN_OUTPUT_BUFFER_MAX_CHARS = 256 * 1024
+# Icons smaller than this are resized with BILINEAR; LANCZOS is only worth its
+# cost at larger sizes
+ICON_LANCZOS_MIN_SIZE = 32
+# Linux terminal emulators tried in order, with the arguments that open one
+# in the workspace folder ("{cwd}" is filled in at launch)
+LINUX_TERMINAL_COMMANDS = (
+    ("gnome-terminal", "--working-directory", "{cwd}"),
+    ("konsole", "--workdir", "{cwd}"),
+    ("xterm", "-e", 'cd "{cwd}"; bash'),
+)
+
+# Starting content of a new sandbox tab
+SANDBOX_TEMPLATE = (
+    "# PriestyCode Sandbox\n"
+    "# This is a temporary file. Save it to keep your changes.\n"
+    "\n"
+    'print("Hello, Sandbox!")\n'
+)
+
+# Number of closed editor tabs kept for reuse instead of being destroyed
+TAB_POOL_MAX = 8
+
+# --- Precompiled patterns for parsing run output ---
+ANSI_ESCAPE_PATTERN = re.compile(r"\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])")
+TRACEBACK_LOCATION_PATTERN = re.compile(r'File "(.*?)", line (\d+)')
+
+# --- ttk Theme ---
+# Created once and applied with a single theme_use instead of per-style calls
+THEME_NAME = "priesty_dark"
+THEME_SETTINGS = {
+    "TPanedwindow": {"configure": {"background": "#2B2B2B"}},
+    "TNotebook": {"configure": {"background": "#2B2B2B", "borderwidth": 0}},
+    "TNotebook.Tab": {
+        "configure": {
+            "background": "#3C3C3C",
+            "foreground": "white",
+            "padding": [10, 5],
+            "font": ("Segoe UI", 10),
+            "borderwidth": 0,
+        },
+        "map": {"background": [("selected", "#2B2B2B"), ("active", "#555555")]},
+    },
+    # File explorer and console trees
+    "Treeview": {
+        "configure": {
+            "background": "#2B2B2B",
+            "foreground": "white",
+            "fieldbackground": "#2B2B2B",
+            "bordercolor": "#2B2B2B",
+            "font": ("Segoe UI", 9),
+        },
+        "map": {
+            "background": [("selected", "#555555")],
+            "foreground": [("selected", "white")],
+        },
+        "layout": [("Treeview.treearea", {"sticky": "nswe"})],
+    },
+    "Treeview.Heading": {
+        "configure": {
+            "font": ("Segoe UI", 9, "bold"),
+            "background": "#3C3C3C",
+            "foreground": "white",
+            "relief": "flat",
+        },
+        "map": {"background": [("active", "#555555")]},
+    },
+    # Editor tab strip; the current tab is marked with the "selected" state
+    "EditorTab.TFrame": {
+        "configure": {"background": "#3C3C3C"},
+        "map": {"background": [("selected", "#2B2B2B")]},
+    },
+    "EditorTab.TLabel": {
+        "configure": {
+            "background": "#3C3C3C",
+            "foreground": "white",
+            "font": ("Segoe UI", 9),
+        },
+        "map": {"background": [("selected", "#2B2B2B")]},
+    },
+}
+
+
+class EditorTab(ttk.Frame):
+    """A tab in the editor tab strip, holding direct references to its parts.
+
+    Click and close callbacks receive the tab itself, so nothing depends on
+    its position and closing another tab needs no rebinding.
+    """
+
+    def __init__(self, master, file_name, icon, on_click, on_close):
+        super().__init__(master, style="EditorTab.TFrame")
+        self.active = False
+        self.icon_label = ttk.Label(self, image=icon or "", style="EditorTab.TLabel")
+        self.icon_label.pack(side="left", padx=(5, 2), pady=2)
+        self.text_label = ttk.Label(self, text=file_name, style="EditorTab.TLabel")
+        self.text_label.pack(side="left", padx=(0, 5), pady=2)
+        self.close_button = tk.Button(
+            self,
+            text="\u2715",
+            bg="#3C3C3C",
+            fg="white",
+            bd=0,
+            relief="flat",
+            activebackground="#E81123",
+            activeforeground="white",
+            font=("Segoe UI", 8, "bold"),
+            command=lambda: on_close(self),
+        )
+        self.close_button.pack(side="right", padx=(5, 5), pady=2)
+        for widget in (self, self.icon_label, self.text_label):
+            widget.bind("<Button-1>", lambda event: on_click(self))
+
+    def set_active(self, active: bool):
+        if active == self.active:
+            return
+        self.active = active
+        state = ["selected"] if active else ["!selected"]
+        for widget in (self, self.icon_label, self.text_label):
+            widget.state(state)
+
+    def set_file_name(self, file_name: str):
+        self.text_label.config(text=file_name)
+
+    def reset(self, file_name: str, icon):
+        """Prepares a closed tab to be shown again for another file."""
+        self.set_active(False)
+        self.icon_label.config(image=icon or "")
+        self.set_file_name(file_name)
+
+
+class OutputTailBuffer:
+    """Accumulates process output, keeping only the most recent max_chars."""
+
+    TRUNCATION_NOTICE = "[... earlier output truncated ...]\n"
+
+    def __init__(self, max_chars: int):
+        self.max_chars = max_chars
+        self.truncated = False
+        self._chunks: collections.deque[str] = collections.deque()
+        self._size = 0
+
+    def append(self, text: str):
+        self._chunks.append(text)
+        self._size += len(text)
+        # Drop whole chunks from the front while the rest still fills the limit
+        while len(self._chunks) > 1:
+            oldest_size = len(self._chunks[0])
+            if self._size - oldest_size < self.max_chars:
+                break
+            self._chunks.popleft()
+            self._size -= oldest_size
+            self.truncated = True
+        # Then cut the oldest remaining chunk, which may be one huge write,
+        # down to what still fits
+        excess = self._size - self.max_chars
+        if excess > 0:
+            self._chunks[0] = self._chunks[0][excess:]
+            self._size -= excess
+            self.truncated = True
+
+    def getvalue(self) -> str:
+        text = "".join(self._chunks)
+        return self.TRUNCATION_NOTICE + text if self.truncated else text
+
+    def clear(self):
+        self._chunks.clear()
+        self._size = 0
+        self.truncated = False
 
 
 class PriestyCode(tk.Tk):
@@ -85,16 +285,32 @@ class PriestyCode(tk.Tk):
         self.config(bg="#2B2B2B")
 
         self.icon_size = 16
-        self.process: subprocess.Popen | None = None
-        self.output_queue: queue.Queue[tuple[str, Union[str, int, None]]] = (
-            queue.Queue()
-        )
-        self.stdin_queue: queue.Queue[str] = queue.Queue()
-        self.stderr_buffer = ""
-        self.stdout_buffer = ""
+        self._icon_cache: dict[tuple[str, int], ImageTk.PhotoImage | None] = {}
+        self.process: asyncio.subprocess.Process | None = None
+        # (run id, text or signal, tag or payload) items filled by the run
+        # loop thread and drained on the Tk thread; deque append/popleft are
+        # atomic, so no lock is needed
+        self.output_queue: collections.deque[
+            tuple[int, str, Union[str, int, bool, None]]
+        ] = collections.deque()
+        # Bumped by every run; queued items from older runs are dropped
+        self._run_id = 0
+        # Set while a stopped run's PROCESS_STOPPED_SIGNAL is still on its way
+        self._stop_report_pending = False
+        # Terminal input for the current run; each run gets a fresh queue so
+        # a stopped run's writer can never take the next run's input
+        self.stdin_queue: queue.Queue[str | None] = queue.Queue()
+        self._output_poll_id: str | None = None
+        self.stderr_buffer = OutputTailBuffer(RUN_OUTPUT_BUFFER_MAX_CHARS)
+        self.stdout_buffer = OutputTailBuffer(RUN_OUTPUT_BUFFER_MAX_CHARS)
         self.open_files: list[str] = []
-        self.tab_widgets: list[tk.Frame] = []
-        self.editor_widgets: list[tk.Frame] = []
+        # on_ready callbacks per file whose read is still on a worker thread
+        self._pending_file_loads: dict[str, list] = {}
+        self.tab_widgets: list[EditorTab] = []
+        # Closed tabs kept for reuse by the next _create_tab
+        self._tab_pool: list[EditorTab] = []
+        # Each editor's frame in the editor area is its master
+        self.editors: list[CodeEditor] = []
         self.current_tab_index = -1
         self.current_open_file: str | None = None
         self.active_editor: CodeEditor | None = None
@@ -104,6 +320,12 @@ class PriestyCode(tk.Tk):
         self.find_replace_dialog: "FindReplaceDialog" | None = None  # type: ignore
         self.venv_warning_shown = False
         self.temp_run_file: str | None = None
+        self.running_inline_sandbox = False
+        # Running state the run/stop button currently shows
+        self._run_button_running = False
+        # (interpreter, process) of the idle worker for the next run; only
+        # touched on the run loop thread
+        self._warm_run_worker: tuple[str, asyncio.subprocess.Process] | None = None
 
         self.file_type_icon_label: tk.Label
         self.file_name_label: tk.Label
@@ -114,6 +336,9 @@ class PriestyCode(tk.Tk):
         self.terminals: list[Terminal] = []
         self.terminal_ui_map: dict[Terminal, tk.Frame] = {}
         self.active_terminal: Terminal | None = None
+        self._terminal_context_menu: tk.Menu | None = None
+        self._context_menu_terminal: Terminal | None = None
+        self._linux_terminal_command: tuple[str, ...] | None = None
         self.terminal_content_frame: tk.Frame
         self.terminal_tabs_sidebar: tk.Frame
         self.add_terminal_button: tk.Button
@@ -124,18 +349,40 @@ class PriestyCode(tk.Tk):
         self._initialize_settings_vars()
         self._load_settings()
 
+        self._start_run_loop()
         self._load_icons()
         self._configure_styles()
         self._setup_layout()
         self._create_top_toolbar()
         self._create_menu_bar()
+
+        # Paint the window shell now and build the heavier widgets once it
+        # is on screen.
+        self.loading_label = tk.Label(
+            self, text="Loading...", bg="#2B2B2B", fg="#888888", font=("Segoe UI", 10)
+        )
+        self.loading_label.grid(row=1, column=0, sticky="nsew")
+        self.update_idletasks()
+        self.after_idle(self._finish_startup)
+
+    def _finish_startup(self):
+        """Second startup phase, run once the toolbar has been painted."""
+        self.loading_label.destroy()
         self._create_main_content_area()
         self._bind_shortcuts()
 
-        self.after(1, self._apply_font_size)
-        self.after(50, self._process_output_queue)
-        self.after(200, self._check_virtual_env)
-        self.after(500, self._open_sandbox_if_empty)
+        self._output_poll_id = self.after(
+            OUTPUT_IDLE_POLL_MS, self._process_output_queue
+        )
+        self.after_idle(self._run_startup_tasks)
+
+    def _run_startup_tasks(self):
+        """One-time work run once the main content area has been laid out."""
+        self._apply_font_size()
+        self.file_explorer.populate_tree()
+        # The sandbox opens first so it is visible behind the venv prompt
+        self._open_sandbox_if_empty()
+        self._check_virtual_env()
 
     def _initialize_settings_vars(self):
         """Initializes all tk.Vars for settings with default values."""
@@ -187,85 +434,133 @@ class PriestyCode(tk.Tk):
 
     def _load_icons(self):
         """Loads and resizes icons used throughout the IDE."""
-        self.window_icon = self._load_and_resize_icon(
-            "priesty.png", is_photo_image=True
-        )
-        if isinstance(self.window_icon, tk.PhotoImage):
+        self._load_window_icon()
+        if self.window_icon is not None:
             self.iconphoto(True, self.window_icon)
 
+        # .ico files are only understood by Tk on Windows; elsewhere iconphoto
+        # above already set the window icon.
         ico_path = os.path.join(ICON_PATH, "Priesty.ico")
-        if os.path.exists(ico_path):
+        if sys.platform == "win32" and os.path.isfile(ico_path):
             try:
                 self.iconbitmap(ico_path)
             except Exception as e:
                 print(f"Warning: Could not set .ico file: {e}")
 
-        self.priesty_icon = self._load_and_resize_icon("priesty.png", size=24)
-        self.folder_icon = self._load_and_resize_icon("folder_icon.png")
-        self.git_icon = self._load_and_resize_icon("git_icon.png")
-        self.run_icon = self._load_and_resize_icon("run.png", size=24)
-        self.pause_icon = self._load_and_resize_icon("pause.png", size=24)
-        self.unknown_file_icon = self._load_and_resize_icon("unknwon.png")
-        self.python_logo_icon = self._load_and_resize_icon("python_logo.png")
-        self.close_icon = self._load_and_resize_icon("close_icon.png", size=12)
-        self.txt_icon = self._load_and_resize_icon("txt_icon.png")
-        self.md_icon = self._load_and_resize_icon("markdown_icon.png")
-        self.add_icon = self._load_and_resize_icon("add_icon.png", size=16)
-        self.terminal_icon = self._load_and_resize_icon("terminal_icon.png", size=16)
-
-        # Icons for autocomplete manager
-        self.snippet_icon = self._load_and_resize_icon("snippet_icon.png")
-        self.keyword_icon = self._load_and_resize_icon("keyword_icon.png")
-        self.function_icon = self._load_and_resize_icon("function_icon.png")
-        self.variable_icon = self._load_and_resize_icon("variable_icon.png")
-
-    def _load_and_resize_icon(self, icon_name, size=None, is_photo_image=False):
-        """Helper to load, resize, and return a PhotoImage from an icon file."""
+        # Attribute name -> (file, size); a size of None uses self.icon_size
+        icon_specs = {
+            "folder_icon": ("folder_icon.png", None),
+            "git_icon": ("git_icon.png", None),
+            "run_icon": ("run.png", 24),
+            "unknown_file_icon": ("unknwon.png", None),
+            "python_logo_icon": ("python_logo.png", None),
+            "txt_icon": ("txt_icon.png", None),
+            "md_icon": ("markdown_icon.png", None),
+            "add_icon": ("add_icon.png", 16),
+            "terminal_icon": ("terminal_icon.png", 16),
+        }
+        prepared_images = self._prepare_icon_images(
+            (icon_name, size or self.icon_size)
+            for icon_name, size in icon_specs.values()
+        )
+        for attr, (icon_name, size) in icon_specs.items():
+            setattr(
+                self,
+                attr,
+                self._load_and_resize_icon(
+                    icon_name, size=size, prepared_images=prepared_images
+                ),
+            )
+
+    def _prepare_icon_images(self, icon_specs):
+        """Decodes and resizes icons in parallel, keyed by (name, size).
+
+        PIL releases the GIL while decoding and resampling, so this spreads
+        the work across cores. Only the PhotoImage creation has to happen on
+        the Tk thread.
+        """
+        with concurrent.futures.ThreadPoolExecutor() as pool:
+            return {
+                spec: pool.submit(self._resize_icon_image, *spec)
+                for spec in set(icon_specs)
+            }
+
+    def _load_window_icon(self):
+        """Sets window_icon and the 24px priesty_icon from one decode."""
+        self.window_icon = None
+        self.priesty_icon = None
+        path = os.path.join(ICON_PATH, "priesty.png")
+        if not os.path.isfile(path):
+            return
         try:
-            path = os.path.join(ICON_PATH, icon_name)
-            if not os.path.exists(path):
-                return None
-            if is_photo_image:
-                return tk.PhotoImage(file=path)
-
-            pil_image = Image.open(path)
-            if size is None:
-                size = self.icon_size
-
-            aspect_ratio = pil_image.width / pil_image.height
-            resized_image = pil_image.resize(
-                (int(aspect_ratio * size), size), Image.Resampling.LANCZOS
+            with Image.open(path) as pil_image:
+                pil_image.load()
+                self.window_icon = ImageTk.PhotoImage(pil_image)
+                self.priesty_icon = ImageTk.PhotoImage(
+                    self._scale_icon_image(pil_image, 24)
+                )
+        except Exception as e:
+            print(f"Error loading icon priesty.png: {e}")
+        self._icon_cache[("priesty.png", 24)] = self.priesty_icon
+
+    @staticmethod
+    def _resize_icon_image(icon_name, size):
+        path = os.path.join(ICON_PATH, icon_name)
+        if not os.path.isfile(path):
+            return None
+        with Image.open(path) as pil_image:
+            return PriestyCode._scale_icon_image(pil_image, size)
+
+    @staticmethod
+    def _scale_icon_image(pil_image, size):
+        aspect_ratio = pil_image.width / pil_image.height
+        target_size = (int(aspect_ratio * size), size)
+        # Lets formats that support it (JPEG) decode at a reduced scale
+        pil_image.draft(None, target_size)
+        resample = (
+            Image.Resampling.LANCZOS
+            if size >= ICON_LANCZOS_MIN_SIZE
+            else Image.Resampling.BILINEAR
+        )
+        # reducing_gap box-shrinks large sources before resampling
+        return pil_image.resize(target_size, resample, reducing_gap=2.0)
+
+    def _load_and_resize_icon(self, icon_name, size=None, prepared_images=None):
+        """Helper to load, resize, and return a PhotoImage from an icon file.
+
+        Results are cached per (name, size) so repeated lookups share one image.
+        prepared_images may hold already resized PIL images from
+        _prepare_icon_images.
+        """
+        if size is None:
+            size = self.icon_size
+        cache_key = (icon_name, size)
+        if cache_key in self._icon_cache:
+            return self._icon_cache[cache_key]
+
+        icon = None
+        try:
+            prepared = (prepared_images or {}).get((icon_name, size))
+            resized_image = (
+                prepared.result()
+                if prepared
+                else self._resize_icon_image(icon_name, size)
             )
-            return ImageTk.PhotoImage(resized_image)
+            if resized_image is not None:
+                icon = ImageTk.PhotoImage(resized_image)
         except Exception as e:
             print(f"Error loading icon {icon_name}: {e}")
-            return None
+        self._icon_cache[cache_key] = icon
+        return icon
 
     def _configure_styles(self):
         """Configures the ttk styles for various widgets."""
         self.style = ttk.Style(self)
-        self.style.theme_use("default")
-        self.style.configure("TPanedwindow", background="#2B2B2B")
-        self.style.configure("TNotebook", background="#2B2B2B", borderwidth=0)
-        self.style.configure(
-            "TNotebook.Tab",
-            background="#3C3C3C",
-            foreground="white",
-            padding=[10, 5],
-            font=("Segoe UI", 10),
-            borderwidth=0,
-        )
-        self.style.map(
-            "TNotebook.Tab", background=[("selected", "#2B2B2B"), ("active", "#555555")]
-        )
-        self.style.configure(
-            "Treeview.Heading",
-            font=("Segoe UI", 9, "bold"),
-            background="#3C3C3C",
-            foreground="white",
-            relief="flat",
-        )
-        self.style.map("Treeview.Heading", background=[("active", "#555555")])
+        if THEME_NAME not in self.style.theme_names():
+            self.style.theme_create(
+                THEME_NAME, parent="default", settings=THEME_SETTINGS
+            )
+        self.style.theme_use(THEME_NAME)
 
     def _setup_layout(self):
         """Sets up the main grid layout for the IDE window."""
@@ -577,15 +872,15 @@ class PriestyCode(tk.Tk):
         self._create_new_terminal()  # Create the first terminal
 
     def _jump_to_error_location(self, file_path, line):
-        self._open_file_from_path(file_path)
-
         def scroll_to_line():
             if self.active_editor and self.active_editor.winfo_exists():
                 self.active_editor.text_area.mark_set(tk.INSERT, f"{line}.0")
                 self.active_editor.text_area.see(tk.INSERT)
                 self.active_editor.text_area.focus_set()
 
-        self.after(50, scroll_to_line)
+        self._open_file_from_path(
+            file_path, on_ready=lambda: self.after(50, scroll_to_line)
+        )
 
     def _create_new_terminal(self):
         new_terminal = Terminal(
@@ -684,24 +979,23 @@ class PriestyCode(tk.Tk):
             self._switch_terminal(self.terminals[-1] if self.terminals else None)  # type: ignore
 
     def _show_terminal_context_menu(self, event, terminal: Terminal):
-        context_menu = tk.Menu(
-            self,
-            tearoff=0,
-            bg="#3C3C3C",
-            fg="white",
-            activebackground="#555555",
-            activeforeground="white",
-        )
-        context_menu.add_command(
-            label="Rename...", command=lambda: self._rename_terminal(terminal)
-        )
-        context_menu.add_command(
-            label="Close", command=lambda: self._close_terminal(terminal)
-        )
+        # Built on first use and reused; the commands act on the terminal
+        # recorded here
+        self._context_menu_terminal = terminal
+        if self._terminal_context_menu is None:
+            self._terminal_context_menu = tk.Menu(self, **MENU_STYLE)
+            self._terminal_context_menu.add_command(
+                label="Rename...",
+                command=lambda: self._rename_terminal(self._context_menu_terminal),
+            )
+            self._terminal_context_menu.add_command(
+                label="Close",
+                command=lambda: self._close_terminal(self._context_menu_terminal),
+            )
         try:
-            context_menu.tk_popup(event.x_root, event.y_root)
+            self._terminal_context_menu.tk_popup(event.x_root, event.y_root)
         finally:
-            context_menu.grab_release()
+            self._terminal_context_menu.grab_release()
 
     def _rename_terminal(self, terminal: Terminal):
         current_name = terminal.display_name_widget.cget("text")  # type: ignore
@@ -723,24 +1017,21 @@ class PriestyCode(tk.Tk):
             self._open_new_sandbox_tab()
 
     def _open_new_sandbox_tab(self, event=None):
-        content = '# PriestyCode Sandbox\n# This is a temporary file. Save it to keep your changes.\n\nprint("Hello, Sandbox!")\n'
-        self._add_new_tab(file_path="sandbox.py", content=content)
+        self._add_new_tab(file_path="sandbox.py", content=SANDBOX_TEMPLATE)
 
     def _check_virtual_env(self):
         found_venv = False
+        script_dir = "Scripts" if sys.platform == "win32" else "bin"
+        python_name = "python.exe" if sys.platform == "win32" else "python"
         for venv_name in (".venv", "venv"):
-            path = os.path.join(self.workspace_root_dir, venv_name)
-            if os.path.isdir(path):
-                script_dir = "Scripts" if sys.platform == "win32" else "bin"
-                potential_path = os.path.join(
-                    path,
-                    script_dir,
-                    "python.exe" if sys.platform == "win32" else "python",
-                )
-                if os.path.exists(potential_path):
-                    self.python_executable = os.path.abspath(potential_path)
-                    found_venv = True
-                    break
+            # One stat on the interpreter itself; a missing venv fails it too
+            potential_path = os.path.join(
+                self.workspace_root_dir, venv_name, script_dir, python_name
+            )
+            if os.path.isfile(potential_path):
+                self.python_executable = os.path.abspath(potential_path)
+                found_venv = True
+                break
 
         if not found_venv:
             self.python_executable = sys.executable
@@ -756,6 +1047,7 @@ class PriestyCode(tk.Tk):
             term.set_python_executable(self.python_executable)
             term.clear()
             term.show_prompt()
+        self._prewarm_run_worker()
 
     def _create_virtual_env(self):
         run_terminal = self._get_run_terminal()
@@ -771,17 +1063,36 @@ class PriestyCode(tk.Tk):
 
         def create():
             try:
-                subprocess.run(
+                # Output is forwarded to the terminal as it arrives rather than
+                # being buffered until venv exits (and then discarded)
+                with subprocess.Popen(
                     [sys.executable, "-m", "venv", venv_dir],
-                    check=True,
-                    capture_output=True,
-                    text=True,
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.STDOUT,
                     cwd=self.workspace_root_dir,
-                )
+                    creationflags=NO_WINDOW_FLAGS,
+                ) as process:
+                    decoder = io.IncrementalNewlineDecoder(
+                        codecs.getincrementaldecoder("utf-8")(errors="replace"),
+                        translate=True,
+                    )
+                    while True:
+                        data = process.stdout.read1(STREAM_READ_SIZE)
+                        text = decoder.decode(data, final=not data)
+                        if text:
+                            self.after(0, run_terminal.write, text)
+                        if not data:
+                            break
+                if process.returncode:
+                    raise subprocess.CalledProcessError(
+                        process.returncode, process.args
+                    )
                 self.after(0, self._check_virtual_env)
                 self.after(0, self.file_explorer.populate_tree)
             except Exception as e:
-                run_terminal.write(f"Failed to create venv: {e}\n", "stderr_tag")
+                self.after(
+                    0, run_terminal.write, f"Failed to create venv: {e}\n", "stderr_tag"
+                )
             finally:
                 self.after(0, run_terminal.show_prompt)
 
@@ -809,6 +1120,7 @@ class PriestyCode(tk.Tk):
                 term.set_python_executable(self.python_executable)
                 term.clear()
                 term.show_prompt()
+            self._prewarm_run_worker()
             messagebox.showinfo(
                 "Interpreter Changed",
                 f"Python interpreter set to:\n{self.python_executable}",
@@ -862,7 +1174,7 @@ class PriestyCode(tk.Tk):
         self._check_virtual_env()
         self.title(f"PriestyCode - {os.path.basename(new_path)}")
 
-    def _open_file_from_path(self, file_path):
+    def _open_file_from_path(self, file_path, on_ready=None):
         if not file_path or file_path == "N/A":
             messagebox.showerror(
                 "Error",
@@ -881,26 +1193,67 @@ class PriestyCode(tk.Tk):
             for open_path in self.open_files:
                 if os.path.basename(open_path) == "sandbox.py":
                     self._switch_to_tab(self.open_files.index(open_path))
-                    return
-            self._open_new_sandbox_tab()
+                    break
+            else:
+                self._open_new_sandbox_tab()
+            if on_ready:
+                on_ready()
             return
         if file_path in self.open_files:
             self._switch_to_tab(self.open_files.index(file_path))
+            if on_ready:
+                on_ready()
         else:
-            self._add_new_tab(file_path=file_path)
+            self._add_new_tab(file_path=file_path, on_ready=on_ready)
+
+    def _add_new_tab(self, file_path=None, content="", extension=".py", on_ready=None):
+        is_sandbox = file_path == "sandbox.py"
+        if file_path and not is_sandbox and not file_path.startswith("Untitled-"):
+            # Read files on a worker thread so large files don't block the UI
+            # A second open while the read is pending just adds its callback
+            if file_path in self._pending_file_loads:
+                self._pending_file_loads[file_path].append(on_ready)
+                return
+            self._pending_file_loads[file_path] = [on_ready]
+            threading.Thread(
+                target=self._read_file_in_thread,
+                args=(file_path,),
+                daemon=True,
+            ).start()
+            return
+        self._create_tab(file_path, content, extension, on_ready)
+
+    def _read_file_in_thread(self, file_path):
+        try:
+            with open(file_path, "r", encoding="utf-8") as f:
+                content = f.read()
+        except Exception as e:
+            self.after(0, self._on_file_load_failed, file_path, e)
+            return
+        self.after(0, self._on_file_loaded, file_path, content)
+
+    def _on_file_loaded(self, file_path, content):
+        callbacks = [cb for cb in self._pending_file_loads.pop(file_path, []) if cb]
+
+        def run_callbacks():
+            for callback in callbacks:
+                callback()
+
+        if file_path in self.open_files:
+            self._switch_to_tab(self.open_files.index(file_path))
+            run_callbacks()
+            return
+        self._create_tab(file_path, content, on_ready=run_callbacks)
 
-    def _add_new_tab(self, file_path=None, content="", extension=".py"):
+    def _on_file_load_failed(self, file_path, error):
+        self._pending_file_loads.pop(file_path, None)
+        messagebox.showerror("Error", f"Failed to open file: {error}")
+
+    def _create_tab(self, file_path=None, content="", extension=".py", on_ready=None):
         editor_frame = tk.Frame(self.editor_content_frame, bg="#2B2B2B")
         editor = CodeEditor(
             editor_frame,
             error_console=self.error_console,
-            autocomplete_icons={
-                "snippet": self.snippet_icon,
-                "keyword": self.keyword_icon,
-                "function": self.function_icon,
-                "variable": self.variable_icon,
-                "class": self.function_icon,
-            },
             autoindent_var=self.autoindent_enabled,
             tooltips_var=self.tooltips_enabled,
         )
@@ -908,15 +1261,7 @@ class PriestyCode(tk.Tk):
 
         is_sandbox = file_path == "sandbox.py"
         is_untitled = False
-        if file_path and not is_sandbox and not file_path.startswith("Untitled-"):
-            try:
-                with open(file_path, "r", encoding="utf-8") as f:
-                    content = f.read()
-            except Exception as e:
-                messagebox.showerror("Error", f"Failed to open file: {e}")
-                editor_frame.destroy()
-                return
-        elif not file_path or file_path.startswith("Untitled-"):
+        if not file_path or file_path.startswith("Untitled-"):
             is_untitled = True
             count = 1
             untitled_name = f"Untitled-{count}{extension}"
@@ -928,49 +1273,31 @@ class PriestyCode(tk.Tk):
         editor.set_file_path(file_path)
         editor.text_area.insert("1.0", content)
         editor.text_area.edit_modified(is_sandbox or is_untitled)
-        self.after(50, editor._on_content_changed)
+        editor.has_unsaved_changes = is_sandbox or is_untitled
+        editor._schedule_content_changed()
         editor.text_area.bind("<<Change>>", self._schedule_autosave)
         self.after(1, lambda: editor.set_font_size(self.font_size.get()))
 
-        tab = tk.Frame(self.tab_bar_frame, bg="#3C3C3C")
-        tab.pack(side="left", fill="y", padx=(0, 1))
         icon, new_index = self._get_icon_for_file(file_path), len(self.open_files)
-        icon_label = (
-            tk.Label(tab, image=icon, bg="#3C3C3C")
-            if icon
-            else tk.Label(tab, bg="#3C3C3C")
-        )
-        icon_label.pack(side="left", padx=(5, 2), pady=2)
-        text_label = tk.Label(
-            tab,
-            text=os.path.basename(file_path),
-            fg="white",
-            bg="#3C3C3C",
-            font=("Segoe UI", 9),
-        )
-        text_label.pack(side="left", padx=(0, 5), pady=2)
-        close_button = tk.Button(
-            tab,
-            text="\u2715",
-            bg="#3C3C3C",
-            fg="white",
-            bd=0,
-            relief="flat",
-            activebackground="#E81123",
-            activeforeground="white",
-            font=("Segoe UI", 8, "bold"),
-        )
-        close_button.pack(side="right", padx=(5, 5), pady=2)
-
-        tab.bind("<Button-1>", lambda e, i=new_index: self._switch_to_tab(i))
-        icon_label.bind("<Button-1>", lambda e, i=new_index: self._switch_to_tab(i))
-        text_label.bind("<Button-1>", lambda e, i=new_index: self._switch_to_tab(i))
-        close_button.config(command=lambda i=new_index: self._close_tab(i))
+        if self._tab_pool:
+            tab = self._tab_pool.pop()
+            tab.reset(os.path.basename(file_path), icon)
+        else:
+            tab = EditorTab(
+                self.tab_bar_frame,
+                os.path.basename(file_path),
+                icon,
+                on_click=self._on_tab_click,
+                on_close=self._close_tab_widget,
+            )
+        tab.pack(side="left", fill="y", padx=(0, 1))
 
         self.open_files.append(file_path)
-        self.editor_widgets.append(editor_frame)
+        self.editors.append(editor)
         self.tab_widgets.append(tab)
         self._switch_to_tab(new_index)
+        if on_ready:
+            on_ready()
 
     def _switch_to_tab(self, index: int):
         if not (0 <= index < len(self.tab_widgets)):
@@ -978,46 +1305,39 @@ class PriestyCode(tk.Tk):
         if (
             self.active_editor
             and self.current_tab_index >= 0
-            and self.current_tab_index < len(self.editor_widgets)
+            and self.current_tab_index < len(self.editors)
         ):
-            self.editor_widgets[self.current_tab_index].pack_forget()
-            self._set_tab_appearance(
-                self.tab_widgets[self.current_tab_index], active=False
-            )
+            self.editors[self.current_tab_index].master.pack_forget()
+            self.tab_widgets[self.current_tab_index].set_active(False)
 
         self.current_tab_index, self.current_open_file = index, self.open_files[index]
-        new_editor_frame = self.editor_widgets[index]
-        new_editor_frame.pack(fill="both", expand=True)
-        self.active_editor = cast(CodeEditor, new_editor_frame.winfo_children()[0])
+        self.active_editor = self.editors[index]
+        self.active_editor.master.pack(fill="both", expand=True)
         self.active_editor.autocomplete_active = self.autocomplete_enabled.get()
         self.active_editor.set_proactive_error_checking(
             self.proactive_errors_enabled.get()
         )
-        self._set_tab_appearance(self.tab_widgets[index], active=True)
+        self.tab_widgets[index].set_active(True)
         self.active_editor.text_area.focus_set()
         self._update_file_header(self.current_open_file)
 
-    def _set_tab_appearance(self, tab_widget, active):
-        bg = "#2B2B2B" if active else "#3C3C3C"
-        tab_widget.config(bg=bg)
-        for child in tab_widget.winfo_children():
-            if isinstance(child, (tk.Label, tk.Frame)):
-                child.config(bg=bg)
+    def _on_tab_click(self, tab):
+        if tab in self.tab_widgets:
+            self._switch_to_tab(self.tab_widgets.index(tab))
+
+    def _close_tab_widget(self, tab) -> bool:
+        if tab not in self.tab_widgets:
+            return False
+        return self._close_tab(self.tab_widgets.index(tab))
 
     def _close_tab(self, index_to_close, force_ask=False, force_close=False) -> bool:
         if not (0 <= index_to_close < len(self.open_files)):
             return False
         file_path_to_close = self.open_files[index_to_close]
         is_sandbox = os.path.basename(file_path_to_close) == "sandbox.py"
-        editor_to_close = cast(
-            CodeEditor, self.editor_widgets[index_to_close].winfo_children()[0]
-        )
+        editor_to_close = self.editors[index_to_close]
 
-        if (
-            not force_close
-            and editor_to_close.text_area.edit_modified()
-            and not is_sandbox
-        ):
+        if not force_close and editor_to_close.has_unsaved_changes and not is_sandbox:
             response = messagebox.askyesnocancel(
                 "Save on Close",
                 f"Save changes to {os.path.basename(file_path_to_close)}?",
@@ -1027,15 +1347,14 @@ class PriestyCode(tk.Tk):
             if response and not self._save_file(index=index_to_close):
                 return False
 
-        self.tab_widgets.pop(index_to_close).destroy()
-        self.editor_widgets.pop(index_to_close).destroy()
+        closed_tab = self.tab_widgets.pop(index_to_close)
+        if len(self._tab_pool) < TAB_POOL_MAX:
+            closed_tab.pack_forget()
+            self._tab_pool.append(closed_tab)
+        else:
+            closed_tab.destroy()
+        self.editors.pop(index_to_close).master.destroy()
         self.open_files.pop(index_to_close)
-        for i, tab in enumerate(self.tab_widgets):
-            close_button = cast(tk.Button, tab.winfo_children()[-1])
-            close_button.config(command=lambda new_i=i: self._close_tab(new_i))
-            for child in tab.winfo_children()[:-1]:
-                child.bind("<Button-1>", lambda e, new_i=i: self._switch_to_tab(new_i))
-            tab.bind("<Button-1>", lambda e, new_i=i: self._switch_to_tab(new_i))
 
         if not self.open_files:
             self.active_editor = None
@@ -1069,15 +1388,16 @@ class PriestyCode(tk.Tk):
         idx = self.current_tab_index if index is None else index
         if not (0 <= idx < len(self.open_files)):
             return False
-        file_path, editor = self.open_files[idx], cast(
-            CodeEditor, self.editor_widgets[idx].winfo_children()[0]
-        )
+        file_path, editor = self.open_files[idx], self.editors[idx]
         if file_path.startswith("Untitled-") or file_path == "sandbox.py":
             return self._save_file_as(index=idx)
+        if not editor.has_unsaved_changes and os.path.isfile(file_path):
+            # Nothing to write; skips copying the whole buffer out of Tk
+            return True
         try:
             with open(file_path, "w", encoding="utf-8") as f:
                 f.write(editor.text_area.get("1.0", "end-1c"))
-            editor.text_area.edit_modified(False)
+            editor.mark_saved()
             return True
         except Exception as e:
             messagebox.showerror("Save Error", f"Failed to save: {e}")
@@ -1099,24 +1419,17 @@ class PriestyCode(tk.Tk):
         )
         if not new_path:
             return False
+        editor = self.editors[idx]
         try:
             with open(new_path, "w", encoding="utf-8") as f:
-                f.write(
-                    cast(
-                        CodeEditor, self.editor_widgets[idx].winfo_children()[0]
-                    ).text_area.get("1.0", "end-1c")
-                )
+                f.write(editor.text_area.get("1.0", "end-1c"))
+            editor.mark_saved()
             if not old_path.startswith("Untitled-"):
                 self.handle_file_rename(old_path, new_path)
             else:
-                self.open_files[idx], editor = new_path, cast(
-                    CodeEditor, self.editor_widgets[idx].winfo_children()[0]
-                )
+                self.open_files[idx] = new_path
                 editor.set_file_path(new_path)
-                editor.text_area.edit_modified(False)
-                cast(tk.Label, self.tab_widgets[idx].winfo_children()[1]).config(
-                    text=os.path.basename(new_path)
-                )
+                self.tab_widgets[idx].set_file_name(os.path.basename(new_path))
                 if idx == self.current_tab_index:
                     self._update_file_header(new_path)
             self.file_explorer.populate_tree()
@@ -1132,7 +1445,16 @@ class PriestyCode(tk.Tk):
             self.autosave_timer = self.after(2000, self._perform_autosave)
 
     def _perform_autosave(self):
-        if self.active_editor and self.active_editor.text_area.edit_modified():
+        file_path = self.current_open_file
+        # Sandbox and Untitled tabs have no file yet; saving them would open
+        # a Save As dialog after every pause in typing
+        if (
+            not file_path
+            or file_path == "sandbox.py"
+            or file_path.startswith("Untitled-")
+        ):
+            return
+        if self.active_editor and self.active_editor.has_unsaved_changes:
             self._save_file()
 
     def _run_code(self, event=None):
@@ -1145,7 +1467,7 @@ class PriestyCode(tk.Tk):
         is_sandbox = self.current_open_file == "sandbox.py"
         if not is_sandbox and (
             self.current_open_file.startswith("Untitled-")
-            or self.active_editor.text_area.edit_modified()
+            or self.active_editor.has_unsaved_changes
         ):
             if not self._save_file():
                 messagebox.showwarning(
@@ -1158,146 +1480,239 @@ class PriestyCode(tk.Tk):
         self.error_console.clear(runtime_only=True)
         run_terminal.clear()
 
-        self.stderr_buffer, self.stdout_buffer, self.is_running = "", "", True
+        self.stderr_buffer.clear()
+        self.stdout_buffer.clear()
+        self._run_id += 1
+        self.is_running = True
         self._update_run_stop_button_state()
-        run_terminal.set_interactive_mode(True)
+        self._poll_output_soon()
+        self.stdin_queue = queue.Queue()
+        run_terminal.set_interactive_mode(True, stdin_queue=self.stdin_queue)
         self.output_notebook.select(0)
         self._switch_terminal(run_terminal)
-        file_to_run = self.current_open_file
-        if is_sandbox:
+        job = {
+            "path": self.current_open_file,
+            "cwd": os.path.dirname(self.current_open_file),
+        }
+        sandbox_code = (
+            self.active_editor.text_area.get("1.0", "end-1c") if is_sandbox else ""
+        )
+        if is_sandbox and self._can_run_inline(sandbox_code):
+            # Sandboxes are handed to the worker as source, skipping the
+            # temporary file round-trip.
+            self.running_inline_sandbox = True
+            job = {"code": sandbox_code, "cwd": self.workspace_root_dir}
+        elif is_sandbox:
             try:
                 temp_file = tempfile.NamedTemporaryFile(
                     mode="w+", suffix=".py", delete=False, encoding="utf-8"
                 )
-                temp_file.write(self.active_editor.text_area.get("1.0", "end-1c"))
+                temp_file.write(sandbox_code)
                 temp_file.close()
                 self.temp_run_file = temp_file.name
-                file_to_run = self.temp_run_file
+                job = {"path": self.temp_run_file, "cwd": self.workspace_root_dir}
             except Exception as e:
                 messagebox.showerror(
                     "Sandbox Error", f"Could not create temporary file for sandbox: {e}"
                 )
                 self._cleanup_after_run()
                 return
-        threading.Thread(
-            target=self._execute_in_thread, args=(file_to_run,), daemon=True
-        ).start()
+        asyncio.run_coroutine_threadsafe(
+            self._execute_process(
+                self.python_executable, job, self.stdin_queue, self._run_id
+            ),
+            self._run_loop,
+        )
+
+    @staticmethod
+    def _can_run_inline(code: str) -> bool:
+        """Whether sandbox code can be run from source instead of a temp file.
 
-    def _start_process_and_threads(self, executable_path, file_path_to_run):
+        Code relying on __file__ needs a real file.
+        """
+        return "__file__" not in code
+
+    def _start_run_loop(self):
+        """Starts the background asyncio loop that drives user processes."""
+        self._run_loop = asyncio.new_event_loop()
+        threading.Thread(target=self._run_loop.run_forever, daemon=True).start()
+
+    def _prewarm_run_worker(self):
+        """Starts an interpreter for the next run while the user is editing."""
+        asyncio.run_coroutine_threadsafe(
+            self._prepare_run_worker(self.python_executable), self._run_loop
+        )
+
+    async def _spawn_run_worker(self, executable_path):
         env = os.environ.copy()
         env["PYTHONUNBUFFERED"] = "1"
         env["PYTHONUTF8"] = "1"
+        return await asyncio.create_subprocess_exec(
+            executable_path,
+            RUN_WORKER_PATH,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            stdin=subprocess.PIPE,
+            creationflags=NO_WINDOW_FLAGS,
+            env=env,
+        )
+
+    async def _prepare_run_worker(self, executable_path):
+        """Keeps one idle worker ready for the given interpreter."""
+        if self._warm_run_worker:
+            warm_executable, warm_process = self._warm_run_worker
+            if warm_executable == executable_path and warm_process.returncode is None:
+                return
+            self._warm_run_worker = None
+            self._discard_run_worker(warm_process)
         try:
-            cwd = (
-                self.workspace_root_dir
-                if self.temp_run_file
-                else os.path.dirname(file_path_to_run)
-            )
-            self.process = subprocess.Popen(
-                [executable_path, file_path_to_run],
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                stdin=subprocess.PIPE,
-                text=True,
-                cwd=cwd,
-                creationflags=(
-                    subprocess.CREATE_NO_WINDOW if sys.platform == "win32" else 0
-                ),
-                encoding="utf-8",
-                errors="replace",
-                bufsize=1,
-                env=env,
-            )
-            stdout_thread = threading.Thread(
-                target=self._read_stream_to_queue,
-                args=(self.process.stdout, "stdout_tag"),
-                daemon=True,
-            )
-            stderr_thread = threading.Thread(
-                target=self._read_stream_to_queue,
-                args=(self.process.stderr, "stderr_tag"),
-                daemon=True,
-            )
-            stdout_thread.start()
-            stderr_thread.start()
-            threading.Thread(target=self._write_to_stdin, daemon=True).start()
-            threading.Thread(
-                target=self._monitor_process,
-                args=(stdout_thread, stderr_thread),
-                daemon=True,
-            ).start()
+            process = await self._spawn_run_worker(executable_path)
         except Exception as e:
-            self.output_queue.put(
-                (PROCESS_ERROR_SIGNAL, f"Failed to start process: {e}")
-            )
-
-    def _monitor_process(
-        self, stdout_thread: threading.Thread, stderr_thread: threading.Thread
-    ):
-        if self.process:
-            return_code = self.process.wait()
-            stdout_thread.join()
-            stderr_thread.join()
-            self.output_queue.put((PROCESS_END_SIGNAL, return_code))
-
-    def _execute_in_thread(self, file_to_run_override=None):
-        file_path = file_to_run_override or self.current_open_file
-        if not file_path:
-            self.output_queue.put((PROCESS_ERROR_SIGNAL, "No file to run."))
+            print(f"Could not start run worker: {e}")
             return
+        if self._warm_run_worker:
+            # A run claimed the previous worker and another prewarm beat us
+            self._discard_run_worker(process)
+        else:
+            self._warm_run_worker = (executable_path, process)
+
+    @staticmethod
+    def _discard_run_worker(process):
+        # An idle worker exits as soon as its stdin closes without a job
+        if process.stdin and not process.stdin.is_closing():
+            process.stdin.close()
+
+    async def _execute_process(self, executable_path, job, stdin_queue, run_id):
+        process = None
+        if self._warm_run_worker:
+            warm_executable, warm_process = self._warm_run_worker
+            self._warm_run_worker = None
+            if warm_executable == executable_path and warm_process.returncode is None:
+                process = warm_process
+            else:
+                self._discard_run_worker(warm_process)
         try:
-            self._start_process_and_threads(self.python_executable, file_path)
+            if process is None:
+                process = await self._spawn_run_worker(executable_path)
+            process.stdin.write((json.dumps(job) + "\n").encode("utf-8"))
+            await process.stdin.drain()
         except Exception as e:
-            self.output_queue.put((PROCESS_ERROR_SIGNAL, str(e)))
+            self._put_output(
+                (run_id, PROCESS_ERROR_SIGNAL, f"Failed to start process: {e}")
+            )
+            return
 
-    def _read_stream_to_queue(self, stream, tag):
-        try:
-            if stream:
-                for char in iter(lambda: stream.read(1), ""):
-                    self.output_queue.put((char, tag))
-        finally:
-            if stream:
-                stream.close()
+        self.process = process
+        asyncio.ensure_future(self._prepare_run_worker(executable_path))
+        stdin_task = asyncio.ensure_future(self._write_to_stdin(process, stdin_queue))
+        await asyncio.gather(
+            self._read_stream_to_queue(process.stdout, "stdout_tag", run_id),
+            self._read_stream_to_queue(process.stderr, "stderr_tag", run_id),
+        )
+        return_code = await process.wait()
+        stdin_queue.put(STDIN_CLOSE_SIGNAL)
+        await stdin_task
+        self._put_output((run_id, PROCESS_END_SIGNAL, return_code))
 
-    def _write_to_stdin(self):
-        while self.process and self.process.poll() is None:
-            try:
-                if self.process.stdin:
-                    self.process.stdin.write(self.stdin_queue.get(timeout=0.5))
-                    self.process.stdin.flush()
-            except queue.Empty:
+    def _put_output(self, item):
+        """Queues run output from the run loop thread for the UI poll.
+
+        No Tk call is made here: one would block the loop thread until the Tk
+        thread is free, and _stop_code's termination runs on this loop.
+        """
+        self.output_queue.append(item)
+
+    async def _read_stream_to_queue(self, stream, tag, run_id):
+        if not stream:
+            return
+        # Translate \r\n and lone \r to \n like text-mode pipes do, even when
+        # a line ending is split across two reads.
+        decoder = io.IncrementalNewlineDecoder(
+            codecs.getincrementaldecoder("utf-8")(errors="replace"), translate=True
+        )
+        while True:
+            data = await stream.read(STREAM_READ_SIZE)
+            text = decoder.decode(data, final=not data)
+            if text:
+                self._put_output((run_id, text, tag))
+            if not data:
+                break
+
+    async def _write_to_stdin(self, process, stdin_queue):
+        """Forwards the run's terminal input until STDIN_CLOSE_SIGNAL arrives.
+
+        The signal is queued when the process exits or the run is stopped.
+        Input that can no longer be delivered is dropped.
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            data = await loop.run_in_executor(None, stdin_queue.get)
+            if data is STDIN_CLOSE_SIGNAL:
+                break
+            if not process.stdin or process.returncode is not None:
                 continue
+            try:
+                process.stdin.write(data.encode("utf-8"))
+                await process.stdin.drain()
             except (IOError, ValueError):
-                break
+                continue
 
-    def _stop_code(self, event=None):
-        if not self.process or self.process.poll() is not None:
+    async def _terminate_process(self, process) -> bool:
+        """Terminates the process, killing it if it does not exit in time.
+
+        Returns True if the process had to be killed.
+        """
+        try:
+            process.terminate()
+            await asyncio.wait_for(process.wait(), timeout=2)
+            return False
+        except ProcessLookupError:
+            return False
+        except asyncio.TimeoutError:
+            process.kill()
+            return True
+
+    async def _stop_process(self, process, run_id):
+        """Terminates a stopped run and queues the result for the UI."""
+        try:
+            was_killed = await self._terminate_process(process)
+        except Exception:
+            was_killed = True
+        self._put_output((run_id, PROCESS_STOPPED_SIGNAL, was_killed))
+
+    def _stop_code(self, event=None, wait=False):
+        """Stops the current run without waiting for the process to exit.
+
+        With wait=True (closing the IDE) termination is waited for, and the
+        process killed if it overruns, so it can't outlive the window.
+        """
+        if not self.process or self.process.returncode is not None:
             self._cleanup_after_run()
             return
+        process = self.process
         run_terminal = self._get_run_terminal()
         if run_terminal:
             run_terminal.set_interactive_mode(False)
-        while not self.stdin_queue.empty():
-            try:
-                self.stdin_queue.get_nowait()
-            except queue.Empty:
-                break
-        try:
-            self.process.terminate()
-            self.process.wait(timeout=2)
-            if run_terminal:
-                run_terminal.write("\n--- Process terminated ---\n", ("stderr_tag",))
-        except Exception:
-            self.process.kill()
-            if run_terminal:
-                run_terminal.write("\n--- Process Killed ---\n", ("stderr_tag",))
+        # Unblocks this run's stdin writer; the queue belongs to this run only
+        self.stdin_queue.put(STDIN_CLOSE_SIGNAL)
+        future = asyncio.run_coroutine_threadsafe(
+            self._stop_process(process, self._run_id), self._run_loop
+        )
+        self._stop_report_pending = True
         self.process = None
         self._cleanup_after_run()
-        if run_terminal:
-            run_terminal.show_prompt()
+        if wait:
+            try:
+                future.result(timeout=CLOSE_STOP_TIMEOUT)
+            except Exception:
+                try:
+                    process.kill()
+                except Exception as e:
+                    print(f"Error killing process: {e}")
 
     def _cleanup_after_run(self):
         self.is_running = False
+        self.running_inline_sandbox = False
         self._update_run_stop_button_state()
         if self.temp_run_file:
             try:
@@ -1308,16 +1723,20 @@ class PriestyCode(tk.Tk):
                 self.temp_run_file = None
 
     def _update_run_stop_button_state(self):
-        icon, cmd, text = (
-            (self.pause_icon, self._stop_code, "Stop")
-            if self.is_running
-            else (self.run_icon, self._run_code, "Run")
-        )
-        self.run_stop_button.config(command=cmd)
+        if self._run_button_running == self.is_running:
+            return
+        self._run_button_running = self.is_running
+        if self.is_running:
+            # Loaded (and cached) on first use; sessions that never run code
+            # skip decoding it
+            icon = self._load_and_resize_icon("pause.png", size=24)
+            cmd, text = self._stop_code, "Stop"
+        else:
+            icon, cmd, text = self.run_icon, self._run_code, "Run"
         if icon:
-            self.run_stop_button.config(image=icon)
+            self.run_stop_button.config(command=cmd, image=icon)
         else:
-            self.run_stop_button.config(text=text)
+            self.run_stop_button.config(command=cmd, text=text)
 
     def _open_find_replace_dialog(self, event=None):
         if not self.active_editor:
@@ -1361,41 +1780,88 @@ class PriestyCode(tk.Tk):
             elif sys.platform == "darwin":
                 subprocess.Popen(["open", "-a", "Terminal", self.workspace_root_dir])
             else:
-                try:
-                    subprocess.Popen(
-                        [
-                            "gnome-terminal",
-                            "--working-directory",
-                            self.workspace_root_dir,
-                        ]
+                if self._linux_terminal_command is None:
+                    # A PATH lookup, done once, instead of launching each
+                    # emulator in turn until one does not fail
+                    self._linux_terminal_command = next(
+                        (
+                            command
+                            for command in LINUX_TERMINAL_COMMANDS
+                            if shutil.which(command[0])
+                        ),
+                        LINUX_TERMINAL_COMMANDS[-1],
                     )
-                except FileNotFoundError:
-                    try:
-                        subprocess.Popen(
-                            ["konsole", "--workdir", self.workspace_root_dir]
-                        )
-                    except FileNotFoundError:
-                        subprocess.Popen(
-                            ["xterm", "-e", f'cd "{self.workspace_root_dir}"; bash']
-                        )
+                subprocess.Popen(
+                    [
+                        arg.format(cwd=self.workspace_root_dir)
+                        for arg in self._linux_terminal_command
+                    ]
+                )
         except Exception as e:
             messagebox.showerror("Error", f"Could not open external terminal: {e}")
 
+    def _poll_output_soon(self):
+        """Switches the output poll to the fast rate for a new run."""
+        if self._output_poll_id:
+            self.after_cancel(self._output_poll_id)
+        self._output_poll_id = self.after(OUTPUT_POLL_MS, self._process_output_queue)
+
     def _process_output_queue(self):
         run_terminal = self._get_run_terminal()
+        pending_chunks: list[str] = []
+        pending_tag: Union[str, int, None] = None
+        processed = 0
         try:
-            while not self.output_queue.empty():
-                char, tag = self.output_queue.get_nowait()
-                if char == PROCESS_END_SIGNAL:
+            while self.output_queue and processed < OUTPUT_BATCH_LIMIT:
+                run_id, char, tag = self.output_queue.popleft()
+                processed += 1
+                if char == PROCESS_STOPPED_SIGNAL:
+                    self._stop_report_pending = False
+                if run_id != self._run_id:
+                    # Left over from a run that a newer run has replaced
+                    continue
+                if char not in (
+                    PROCESS_END_SIGNAL,
+                    PROCESS_ERROR_SIGNAL,
+                    PROCESS_STOPPED_SIGNAL,
+                ):
+                    # Coalesce consecutive same-tag output into a single write
+                    if pending_chunks and tag != pending_tag:
+                        self._flush_output_chunk(
+                            run_terminal, "".join(pending_chunks), pending_tag
+                        )
+                        pending_chunks = []
+                    pending_chunks.append(char)
+                    pending_tag = tag
+                    continue
+
+                if pending_chunks:
+                    self._flush_output_chunk(
+                        run_terminal, "".join(pending_chunks), pending_tag
+                    )
+                    pending_chunks = []
+                if char == PROCESS_STOPPED_SIGNAL:
+                    if run_terminal:
+                        message = (
+                            "\n--- Process Killed ---\n"
+                            if tag
+                            else "\n--- Process terminated ---\n"
+                        )
+                        run_terminal.write(message, ("stderr_tag",))
+                        run_terminal.show_prompt()
+                elif not self.is_running:
+                    # The run was stopped; its end was reported by the stop
+                    continue
+                elif char == PROCESS_END_SIGNAL:
                     if isinstance(tag, int):
-                        full_traceback = self.stderr_buffer + self.stdout_buffer
+                        stderr_text = self.stderr_buffer.getvalue()
+                        full_traceback = stderr_text + self.stdout_buffer.getvalue()
                         # Improved check for runtime errors vs handled exceptions
                         if tag != 0 and (
-                            "Error" in self.stderr_buffer
-                            or "Exception" in self.stderr_buffer
+                            "Error" in stderr_text or "Exception" in stderr_text
                         ):
                             self._handle_error_output(
-                                self.stderr_buffer, "Runtime Error", "runtime"
+                                stderr_text, "Runtime Error", "runtime"
                             )
                         elif (
                             tag == 0
@@ -1405,12 +1871,12 @@ class PriestyCode(tk.Tk):
                             self._handle_error_output(
                                 full_traceback, "Handled Exception", "handled"
                             )
-                        elif tag != 0 and self.stderr_buffer.strip():
+                        elif tag != 0 and stderr_text.strip():
                             self.error_console.display_errors(
                                 [
                                     {
                                         "title": "Execution Error",
-                                        "details": self.stderr_buffer.strip(),
+                                        "details": stderr_text.strip(),
                                         "file_path": "N/A",
                                         "line": 1,
                                         "col": 1,
@@ -1420,8 +1886,9 @@ class PriestyCode(tk.Tk):
                             self.output_notebook.select(1)
                     self._cleanup_after_run()
                     run_terminal.set_interactive_mode(False)
-                    self.stderr_buffer, self.stdout_buffer = "", ""
-                elif char == PROCESS_ERROR_SIGNAL:
+                    self.stderr_buffer.clear()
+                    self.stdout_buffer.clear()
+                else:
                     self._cleanup_after_run()
                     run_terminal.set_interactive_mode(False)
                     self.error_console.display_errors(
@@ -1436,33 +1903,44 @@ class PriestyCode(tk.Tk):
                         ]
                     )
                     self.output_notebook.select(1)
-                else:
-                    if run_terminal:
-                        run_terminal.write(char, (str(tag),))
-                    if tag == "stderr_tag":
-                        self.stderr_buffer += char
-                    elif tag == "stdout_tag":
-                        self.stdout_buffer += char
-        except queue.Empty:
-            pass
         finally:
-            self.after(50, self._process_output_queue)
+            if pending_chunks:
+                self._flush_output_chunk(
+                    run_terminal, "".join(pending_chunks), pending_tag
+                )
+            # A batch cut off by the limit continues at once; otherwise poll
+            # quickly only while a run can still produce output
+            if processed >= OUTPUT_BATCH_LIMIT:
+                delay = 0
+            elif self.is_running or self.output_queue or self._stop_report_pending:
+                delay = OUTPUT_POLL_MS
+            else:
+                delay = OUTPUT_IDLE_POLL_MS
+            self._output_poll_id = self.after(delay, self._process_output_queue)
+
+    def _flush_output_chunk(self, run_terminal, text, tag):
+        """Writes a coalesced run of same-tag output to the terminal."""
+        if run_terminal:
+            run_terminal.write(text, (str(tag),))
+        if tag == "stderr_tag":
+            self.stderr_buffer.append(text)
+        elif tag == "stdout_tag":
+            self.stdout_buffer.append(text)
 
     def _handle_error_output(self, error_text, default_title, highlight_type):
-        full_error_text = re.sub(
-            r"\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])", "", error_text
-        ).strip()
-        traceback_matches = list(
-            re.finditer(r'File "(.*?)", line (\d+)', full_error_text)
-        )
+        full_error_text = ANSI_ESCAPE_PATTERN.sub("", error_text).strip()
+        location_match = self._find_last_traceback_location(full_error_text)
 
-        if traceback_matches:
-            file_path, line_num_str = traceback_matches[-1].groups()
+        if location_match:
+            file_path, line_num_str = location_match.groups()
             line_num = int(line_num_str)
-            is_temp_file = self.temp_run_file and os.path.normcase(
-                file_path
-            ) == os.path.normcase(self.temp_run_file)
-            last_line = full_error_text.strip().split("\n")[-1]
+            is_temp_file = (
+                self.running_inline_sandbox and file_path == INLINE_RUN_FILENAME
+            ) or (
+                self.temp_run_file
+                and os.path.normcase(file_path) == os.path.normcase(self.temp_run_file)
+            )
+            last_line = full_error_text.rsplit("\n", 1)[-1]
             error_title = last_line if ": " in last_line else default_title
 
             editor_to_highlight, error_file_path_for_panel = None, file_path
@@ -1471,9 +1949,7 @@ class PriestyCode(tk.Tk):
                 error_file_path_for_panel = "sandbox.py"  # For display
                 for i, open_path in enumerate(self.open_files):
                     if open_path == "sandbox.py":
-                        editor_to_highlight = cast(
-                            CodeEditor, self.editor_widgets[i].winfo_children()[0]
-                        )
+                        editor_to_highlight = self.editors[i]
                         break
             else:
                 norm_error_path = os.path.normcase(os.path.abspath(file_path))
@@ -1483,9 +1959,7 @@ class PriestyCode(tk.Tk):
                         and os.path.normcase(os.path.abspath(open_path))
                         == norm_error_path
                     ):
-                        editor_to_highlight = cast(
-                            CodeEditor, self.editor_widgets[i].winfo_children()[0]
-                        )
+                        editor_to_highlight = self.editors[i]
                         break
 
             if editor_to_highlight:
@@ -1523,13 +1997,27 @@ class PriestyCode(tk.Tk):
             )
             self.output_notebook.select(1)
 
+    @staticmethod
+    def _find_last_traceback_location(error_text):
+        """Returns the match for the innermost 'File "...", line N' entry.
+
+        Only the last frame is needed, so the text is searched backwards from
+        its end instead of matching every frame of a long traceback.
+        """
+        position = error_text.rfind('File "')
+        while position != -1:
+            match = TRACEBACK_LOCATION_PATTERN.match(error_text, position)
+            if match:
+                return match
+            position = error_text.rfind('File "', 0, position)
+        return None
+
     def run(self):
         self.protocol("WM_DELETE_WINDOW", self._on_closing)
         self.mainloop()
 
     def run_file_from_explorer(self, path):
-        self._open_file_from_path(path)
-        self.after(100, self._run_code)
+        self._open_file_from_path(path, on_ready=self._run_code)
 
     def handle_file_rename(self, old_path, new_path):
         old_path_norm = os.path.normcase(old_path)
@@ -1543,11 +2031,9 @@ class PriestyCode(tk.Tk):
         if old_path in self.open_files:
             idx = self.open_files.index(old_path)
             self.open_files[idx] = new_path
-            editor = cast(CodeEditor, self.editor_widgets[idx].winfo_children()[0])
+            editor = self.editors[idx]
             editor.set_file_path(new_path)
-            cast(tk.Label, self.tab_widgets[idx].winfo_children()[1]).config(
-                text=os.path.basename(new_path)
-            )
+            self.tab_widgets[idx].set_file_name(os.path.basename(new_path))
             if idx == self.current_tab_index:
                 self._update_file_header(new_path)
 
@@ -1637,7 +2123,7 @@ class PriestyCode(tk.Tk):
     def _on_closing(self):
         self._save_settings()
         if self.is_running:
-            self._stop_code()
+            self._stop_code(wait=True)
         while self.open_files:
             if not self._close_tab(0, force_ask=True):
                 return
@@ -1660,13 +2146,15 @@ class PriestyCode(tk.Tk):
 
     def _reset_layout(self, event=None):
         self.update_idletasks()
+        # ttk panedwindows position sashes with sashpos; the classic
+        # sash_place is not supported by them.
         try:
-            self.main_paned_window.sash_place(
-                0, int(self.main_paned_window.winfo_width() * 0.2), 0
+            self.main_paned_window.sashpos(
+                0, int(self.main_paned_window.winfo_width() * 0.2)
             )
-            self.right_pane.sash_place(0, 0, int(self.right_pane.winfo_height() * 0.7))
-        except tk.TclError:
-            self.after(100, self._reset_layout)
+            self.right_pane.sashpos(0, int(self.right_pane.winfo_height() * 0.7))
+        except tk.TclError as e:
+            print(f"Could not reset layout: {e}")
 
     def _zoom_in(self, event=None):
         self.font_size.set(min(30, self.font_size.get() + 1))
@@ -1693,14 +2181,15 @@ class PriestyCode(tk.Tk):
 
     def _apply_font_size(self):
         new_size = self.font_size.get()
-        for editor_frame in self.editor_widgets:
-            cast(CodeEditor, editor_frame.winfo_children()[0]).set_font_size(new_size)
+        for editor in self.editors:
+            editor.set_font_size(new_size)
         for term in self.terminals:
             term.text.config(font=("Consolas", new_size))
         # Update the treeview font size in the console
-        self.style.configure("Treeview", rowheight=int(new_size * 2.2))
+        self.style.configure(
+            "Treeview", rowheight=int(new_size * 2.2), font=("Segoe UI", new_size)
+        )
         self.style.configure("Treeview.Heading", font=("Segoe UI", new_size, "bold"))
-        self.style.configure("Treeview", font=("Segoe UI", new_size))
         self._save_settings()
 
 
@@ -0,0 +1,94 @@
+# run_worker.py
+
+"""Pre-started interpreter that runs a single user program for PriestyCode.
+
+The IDE launches this script ahead of time so pressing Run does not have to
+wait for a fresh interpreter to start. The first line read from stdin is a
+JSON job ({"cwd": ..., "path": ...} or {"cwd": ..., "code": ...}); everything
+after it is passed through as the program's own stdin. Each worker runs one
+program and exits, so runs stay as isolated as a plain `python file.py`.
+
+This file is executed by the user's interpreter, so it sticks to the stdlib.
+"""
+
+import os
+import sys
+
+# Modules a plain `python file.py` already has loaded when the program starts
+STARTUP_MODULES = frozenset(sys.modules)
+
+import json  # noqa: E402
+import linecache  # noqa: E402
+import traceback  # noqa: E402
+
+INLINE_FILENAME = "<string>"
+
+
+def _print_user_traceback(exc, filename):
+    """Prints the traceback without the worker's own frames."""
+    tb = exc.__traceback__
+    while tb is not None and tb.tb_frame.f_code.co_filename != filename:
+        tb = tb.tb_next
+    traceback.print_exception(type(exc), exc, tb)
+
+
+def _unload_worker_modules(keep=()):
+    """Forgets the modules imported by the worker itself.
+
+    Otherwise a program with its own json.py (say) would be handed the
+    stdlib module the worker loaded. The worker keeps its references, so
+    this file's functions still work.
+    """
+    for name in list(sys.modules):
+        if name not in STARTUP_MODULES and name not in keep:
+            del sys.modules[name]
+
+
+def main():
+    header = sys.stdin.readline()
+    if not header:
+        # The IDE discarded this worker without handing it a job
+        return 0
+    job = json.loads(header)
+    os.chdir(job["cwd"])
+
+    main_module = type(sys)("__main__")
+    # linecache stays registered for inline code, since it holds the source
+    keep_modules = ()
+    if "code" in job:
+        filename = INLINE_FILENAME
+        keep_modules = ("linecache",)
+        source = job["code"]
+        sys.argv = ["-c"]
+        sys.path[0] = ""
+        # There is no file to read the source back from, so tracebacks and
+        # inspect would otherwise show no code lines
+        linecache.cache[filename] = (
+            len(source),
+            None,
+            source.splitlines(True),
+            filename,
+        )
+    else:
+        filename = job["path"]
+        with open(filename, "rb") as f:
+            source = f.read()
+        main_module.__file__ = filename
+        sys.argv = [filename]
+        sys.path[0] = os.path.dirname(os.path.abspath(filename))
+    main_module.__builtins__ = __builtins__
+    sys.modules["__main__"] = main_module
+    _unload_worker_modules(keep_modules)
+
+    try:
+        exec(compile(source, filename, "exec"), main_module.__dict__)
+    except SystemExit:
+        raise
+    except BaseException as exc:
+        _print_user_traceback(exc, filename)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -5,12 +5,45 @@ from tkinter import scrolledtext
 import subprocess
 import threading
 import queue
+import codecs
+import io
 import os
 import sys
 import shutil
 import time
 import re
 
+# Maximum bytes forwarded to the UI per read from a shell command's output
+OUTPUT_READ_SIZE = 64 * 1024
+# Keeps console programs from opening a window of their own on Windows
+NO_WINDOW_FLAGS = subprocess.CREATE_NO_WINDOW if sys.platform == "win32" else 0
+
+
+# Maximum number of resolved command paths remembered by _find_executable
+EXECUTABLE_CACHE_SIZE = 64
+# (command, search path) -> resolved path of commands found earlier. Failed
+# lookups are not kept, so a tool installed mid-session is found next time
+_executable_cache: dict[tuple[str, str], str] = {}
+
+
+def _find_executable(command_exe, search_path):
+    """shutil.which, remembering the commands it found.
+
+    Names with a directory part are resolved against the process's current
+    directory, not the terminal's, so they are looked up every time.
+    """
+    if os.path.dirname(command_exe):
+        return shutil.which(command_exe, path=search_path)
+    key = (command_exe, search_path)
+    full_path = _executable_cache.get(key)
+    if full_path is None:
+        full_path = shutil.which(command_exe, path=search_path)
+        if full_path:
+            if len(_executable_cache) >= EXECUTABLE_CACHE_SIZE:
+                _executable_cache.clear()
+            _executable_cache[key] = full_path
+    return full_path
+
 
 class Terminal(tk.Frame):
     def __init__(
@@ -18,7 +51,9 @@ class Terminal(tk.Frame):
     ):
         super().__init__(parent, bg="#1E1E1E")
         self.cwd = cwd
-        self.python_executable = python_executable
+        self.set_python_executable(python_executable)
+        # ((python_executable, cwd), (venv text, path text)) of the last prompt
+        self._prompt_cache = (None, ("", ""))
         self.stdin_queue = stdin_queue
         self.process = None
         self.interactive_mode = False
@@ -122,9 +157,36 @@ class Terminal(tk.Frame):
 
     def set_python_executable(self, new_path: str):
         self.python_executable = new_path
+        # Paths found for the old interpreter's Scripts folder no longer apply
+        _executable_cache.clear()
+        # Resolved once here rather than probed again for every command
+        self.venv_root = self._find_venv_root(new_path)
+        self.execution_env = self._get_execution_env()
+        self.command_search_path = (
+            f"{os.path.dirname(new_path)}{os.pathsep}"
+            f"{self.execution_env.get('PATH', '')}"
+        )
 
-    def set_interactive_mode(self, is_interactive: bool):
+    @staticmethod
+    def _find_venv_root(python_executable: str) -> str | None:
+        scripts_dir = os.path.dirname(python_executable)
+        if os.path.basename(scripts_dir).lower() not in ("scripts", "bin"):
+            return None
+        potential_root = os.path.dirname(scripts_dir)
+        try:
+            # pyvenv.cfg marks a virtual environment; one stat call
+            os.stat(os.path.join(potential_root, "pyvenv.cfg"))
+        except OSError:
+            return None
+        return potential_root
+
+    def set_interactive_mode(
+        self, is_interactive: bool, stdin_queue: queue.Queue | None = None
+    ):
+        """Toggles run input mode; stdin_queue receives the new run's input."""
         self.interactive_mode = is_interactive
+        if stdin_queue is not None:
+            self.stdin_queue = stdin_queue
         if not is_interactive:
             self.text.config(state="normal")
             self.after(100, self.show_prompt)
@@ -155,6 +217,9 @@ class Terminal(tk.Frame):
     def _write_segment_with_ansi(self, text: str, additional_tags: list[str]):
         text_to_process = self.ansi_buffer + text
         self.ansi_buffer = ""
+        # (text, tags) pairs for one multi-range Text.insert at the end, rather
+        # than a Tcl call per colour run
+        insert_args = []
 
         last_end = 0
         for match in self.ansi_escape_pattern.finditer(text_to_process):
@@ -162,9 +227,7 @@ class Terminal(tk.Frame):
 
             if start > last_end:
                 current_combined_tags = tuple(self.current_tags + additional_tags)
-                self.text.insert(
-                    tk.END, text_to_process[last_end:start], current_combined_tags
-                )
+                insert_args += (text_to_process[last_end:start], current_combined_tags)
 
             escape_code = match.group(0)
             parts_str = escape_code.strip("\x1b[").strip("m")
@@ -206,11 +269,13 @@ class Terminal(tk.Frame):
             self.ansi_buffer = remaining_text[partial_code_index:]
             if safe_to_insert:
                 current_combined_tags = tuple(self.current_tags + additional_tags)
-                self.text.insert(tk.END, safe_to_insert, current_combined_tags)
+                insert_args += (safe_to_insert, current_combined_tags)
         else:
             if remaining_text:
                 current_combined_tags = tuple(self.current_tags + additional_tags)
-                self.text.insert(tk.END, remaining_text, current_combined_tags)
+                insert_args += (remaining_text, current_combined_tags)
+        if insert_args:
+            self.text.insert(tk.END, *insert_args)
 
     def clear(self):
         self.text.config(state="normal")
@@ -224,12 +289,33 @@ class Terminal(tk.Frame):
             last_char = self.text.get("end-2c")
             if last_char != "\n":
                 self.text.insert(tk.END, "\n")
+        venv_text, path_text = self._get_prompt_text()
+        insert_args = [path_text, ("prompt_path",), "> ", ("prompt_arrow",)]
+        if venv_text:
+            insert_args[:0] = [venv_text, ("prompt_venv",)]
+        self.text.insert(tk.END, *insert_args)
+        self.text.mark_set(self.input_start_mark, self.text.index(f"{tk.END}-1c"))
+        self.text.see(tk.END)
+        self.text.config(state="normal")
+        self.current_tags = []
+
+    def _get_prompt_text(self):
+        """Returns the prompt's (venv, path) text for the current state.
+
+        The prompt only changes with the interpreter or the working
+        directory, so it is rebuilt only when one of them has changed.
+        """
+        key = (self.python_executable, self.cwd)
+        if self._prompt_cache[0] == key:
+            return self._prompt_cache[1]
+
+        venv_text = ""
         is_venv = ".venv" in self.python_executable or "venv" in self.python_executable
         if is_venv:
             venv_name = os.path.basename(
                 os.path.dirname(os.path.dirname(self.python_executable))
             )
-            self.text.insert(tk.END, f"({venv_name}) ", ("prompt_venv",))
+            venv_text = f"({venv_name}) "
         home_dir = os.path.expanduser("~")
         display_path = self.cwd
         try:
@@ -239,12 +325,9 @@ class Terminal(tk.Frame):
                 display_path = display_path.replace("\\", "/")
         except Exception:
             pass
-        self.text.insert(tk.END, f"{display_path} ", ("prompt_path",))
-        self.text.insert(tk.END, "> ", ("prompt_arrow",))
-        self.text.mark_set(self.input_start_mark, self.text.index(f"{tk.END}-1c"))
-        self.text.see(tk.END)
-        self.text.config(state="normal")
-        self.current_tags = []
+        prompt_text = (venv_text, f"{display_path} ")
+        self._prompt_cache = (key, prompt_text)
+        return prompt_text
 
     # FIX: Replaced _on_modify with a robust preventative key handler
     def _on_key(self, event):
@@ -339,8 +422,7 @@ class Terminal(tk.Frame):
         ).start()
 
     def _execute_command_in_thread(self, command_str: str):
-        env = self._get_execution_env()
-        scripts_dir = os.path.dirname(self.python_executable)
+        env = self.execution_env
         try:
             parts = command_str.split()
             command_exe = parts[0]
@@ -348,8 +430,7 @@ class Terminal(tk.Frame):
         except IndexError:
             self.after(0, self.show_prompt)
             return
-        search_path = f"{scripts_dir}{os.pathsep}{env.get('PATH', '')}"
-        full_command_path = shutil.which(command_exe, path=search_path)
+        full_command_path = _find_executable(command_exe, self.command_search_path)
         if full_command_path:
             command_to_run = [full_command_path] + command_args
             use_shell = False
@@ -362,20 +443,27 @@ class Terminal(tk.Frame):
                 shell=use_shell,
                 stdout=subprocess.PIPE,
                 stderr=subprocess.STDOUT,
-                text=True,
                 cwd=self.cwd,
                 env=env,
-                bufsize=1,
-                universal_newlines=True,
-                creationflags=(
-                    subprocess.CREATE_NO_WINDOW if sys.platform == "win32" else 0
-                ),
-                encoding="utf-8",
+                creationflags=NO_WINDOW_FLAGS,
             )
             if self.process.stdout:
-                for line in iter(self.process.stdout.readline, ""):
-                    self.after(0, self.write, line)
+                # Forward whatever output is available in one write instead of
+                # scheduling a UI callback per line.
+                decoder = io.IncrementalNewlineDecoder(
+                    codecs.getincrementaldecoder("utf-8")(errors="replace"),
+                    translate=True,
+                )
+                while True:
+                    data = self.process.stdout.read1(OUTPUT_READ_SIZE)
+                    text = decoder.decode(data, final=not data)
+                    if text:
+                        self.after(0, self.write, text)
+                    if not data:
+                        break
         except FileNotFoundError:
+            # A remembered path whose binary has since been removed
+            _executable_cache.pop((command_exe, self.command_search_path), None)
             err_msg = f"Command not found: {command_exe}\n"
             self.after(0, self.write, err_msg, ("stderr_tag",))
         except Exception as e:
@@ -391,16 +479,9 @@ class Terminal(tk.Frame):
         env["PYTHONUNBUFFERED"] = "1"
         env["FORCE_COLOR"] = "1"
         scripts_dir = os.path.dirname(self.python_executable)
-        venv_root = None
-        if os.path.basename(scripts_dir).lower() in ("scripts", "bin"):
-            potential_root = os.path.dirname(scripts_dir)
-            if os.path.exists(os.path.join(potential_root, "pyvenv.cfg")):
-                venv_root = potential_root
-        if venv_root:
-            env["VIRTUAL_ENV"] = venv_root
-            env["PATH"] = scripts_dir + os.pathsep + env.get("PATH", "")
-        else:
-            env["PATH"] = scripts_dir + os.pathsep + env.get("PATH", "")
+        if self.venv_root:
+            env["VIRTUAL_ENV"] = self.venv_root
+        env["PATH"] = scripts_dir + os.pathsep + env.get("PATH", "")
         if sys.platform == "win32" and "PATH" in env:
             original_paths = env["PATH"].split(os.pathsep)
             filtered_paths = [
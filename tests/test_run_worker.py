@@ -0,0 +1,79 @@
+# test_run_worker.py
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import textwrap
+import unittest
+
+RUN_WORKER_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "src",
+    "run_worker.py",
+)
+
+
+def run_job(job, stdin=""):
+    """Runs one job through a fresh worker, returning the finished process."""
+    return subprocess.run(
+        [sys.executable, RUN_WORKER_PATH],
+        input=json.dumps(job) + "\n" + stdin,
+        capture_output=True,
+        text=True,
+        timeout=30,
+    )
+
+
+class RunWorkerTest(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.tmp_dir = self._tmp.name
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def _write(self, name, source):
+        path = os.path.join(self.tmp_dir, name)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(textwrap.dedent(source))
+        return path
+
+    def test_runs_file_with_argv_and_stdin(self):
+        path = self._write(
+            "main.py",
+            """
+            import sys
+            print(__name__, sys.argv[0] == __file__, input())
+            """,
+        )
+        result = run_job({"cwd": self.tmp_dir, "path": path}, stdin="hello\n")
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertEqual(result.stdout, "__main__ True hello\n")
+
+    def test_script_shadowing_stdlib_module_gets_its_own(self):
+        # The worker imports these itself; the program must still see its own
+        for name in ("json", "traceback", "linecache"):
+            self._write(f"{name}.py", "SHADOWED = True\n")
+        path = self._write(
+            "main.py",
+            """
+            import json, linecache, traceback
+            print(json.SHADOWED, linecache.SHADOWED, traceback.SHADOWED)
+            """,
+        )
+        result = run_job({"cwd": self.tmp_dir, "path": path})
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertEqual(result.stdout, "True True True\n")
+
+    def test_traceback_omits_worker_frames(self):
+        path = self._write("main.py", "raise ValueError('boom')\n")
+        result = run_job({"cwd": self.tmp_dir, "path": path})
+        self.assertEqual(result.returncode, 1)
+        self.assertIn("ValueError: boom", result.stderr)
+        self.assertNotIn("run_worker.py", result.stderr)
+
+
+if __name__ == "__main__":
+    unittest.main()